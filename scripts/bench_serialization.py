@@ -0,0 +1,70 @@
+"""Microbenchmark: session state serializers vs. the original JSON path.
+
+Usage::
+
+    python scripts/bench_serialization.py [--messages 40] [--repeat 2000]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from orchestra.interfaces import ConversationState, Message, MessageType
+from orchestra.persistence.serialization import get_serializer, loads_state
+
+
+def build_state(num_messages: int) -> ConversationState:
+    session_id = "call-7f3a9c"
+    messages = []
+    for i in range(num_messages):
+        message_type = MessageType.USER_INPUT if i % 2 == 0 else MessageType.SYSTEM_RESPONSE
+        messages.append(
+            Message(
+                type=message_type,
+                content=f"Turn {i}: could I get two falafel wraps and a baklava please?",
+                metadata={"platform": "vapi", "confidence": 0.93},
+                timestamp=1700000000.0 + i,
+                session_id=session_id,
+            )
+        )
+    return ConversationState(
+        session_id=session_id,
+        messages=messages,
+        context={"phone_number": "+15550100"},
+        current_intent="menu_query",
+    )
+
+
+def bench(label, encode, decode, repeat):
+    payload = encode()
+    enc = min(timeit.repeat(encode, number=repeat, repeat=3)) / repeat
+    dec = min(timeit.repeat(lambda: decode(payload), number=repeat, repeat=3)) / repeat
+    print(f"{label:<22} {len(payload):>8} B {enc * 1e6:>10.1f} us {dec * 1e6:>10.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    state = build_state(args.messages)
+    print(f"{'codec':<22} {'size':>10} {'encode':>13} {'decode':>13}")
+    bench(
+        "json (baseline)",
+        lambda: json.dumps(state.model_dump(mode="json")),
+        lambda data: ConversationState(**json.loads(data)),
+        args.repeat,
+    )
+    for name in ("json", "msgpack"):
+        for threshold, suffix in ((None, ""), (1024, "+zlib")):
+            serializer = get_serializer(name, threshold)
+            bench(f"{name}{suffix}", lambda: serializer.dumps(state), loads_state, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
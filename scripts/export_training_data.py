@@ -0,0 +1,64 @@
+"""Export conversation transcripts as compressed JSONL shards for training.
+
+Examples::
+
+    python scripts/export_training_data.py out/ --log logs/interactions.jsonl
+    python scripts/export_training_data.py out/ --archive sqlite:///orchestra.db \\
+        --start 2024-01-01 --end 2024-02-01 --intent menu_query --processes 4
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from orchestra.persistence.training_export import (
+    DEDUPE_WINDOW,
+    ExportFilters,
+    archive_tasks,
+    export,
+    log_tasks,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    parser.add_argument("--log", action="append", default=[], help="interaction log file (repeatable)")
+    parser.add_argument("--archive", help="archive database URL")
+    parser.add_argument("--start", type=datetime.fromisoformat)
+    parser.add_argument("--end", type=datetime.fromisoformat)
+    parser.add_argument("--intent", action="append", help="keep only these intents (repeatable)")
+    parser.add_argument("--tenant", action="append", help="keep only these tenants (repeatable)")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--shard-size", type=int, default=50_000)
+    parser.add_argument(
+        "--dedupe-window",
+        type=int,
+        default=DEDUPE_WINDOW,
+        help="distinct turns remembered per worker for duplicate detection",
+    )
+    args = parser.parse_args()
+
+    filters = ExportFilters(
+        start=args.start,
+        end=args.end,
+        intents=set(args.intent) if args.intent else None,
+        tenants=set(args.tenant) if args.tenant else None,
+    )
+    tasks = log_tasks(args.log, filters)
+    if args.archive:
+        if not (args.start and args.end):
+            parser.error("--archive requires --start and --end")
+        tasks += archive_tasks(args.archive, args.start, args.end, filters)
+    if not tasks:
+        parser.error("nothing to export: pass --log and/or --archive")
+
+    manifest = export(tasks, args.out_dir, args.processes, args.shard_size, args.dedupe_window)
+    print(f"wrote {manifest['records']} records in {len(manifest['shards'])} shards to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Replay a corpus of turns and report how many skip the response LLM.
+
+The corpus is a JSONL interaction log (as written by ``LoggingService``)
+with ``user_input`` and ``intent`` fields.  Without a corpus a small
+built-in sample is used::
+
+    python scripts/replay_responder.py [logs/interactions.jsonl]
+"""
+
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from orchestra.execution.tool_executor import ToolExecutor
+from orchestra.orchestration.responder import TemplateResponder
+
+# Mirrors LangGraphOrchestrator._select_tools
+INTENT_TOOLS = {"menu_query": "get_menu", "business_hours": "get_business_hours"}
+
+SAMPLE_CORPUS = [
+    {"user_input": "What's on the menu?", "intent": "menu_query"},
+    {"user_input": "What desserts do you have?", "intent": "menu_query"},
+    {"user_input": "How much is the falafel wrap?", "intent": "menu_query"},
+    {"user_input": "Tell me about the gyro platter", "intent": "menu_query"},
+    {"user_input": "Which appetizers are vegetarian?", "intent": "menu_query"},
+    {"user_input": "What are your hours?", "intent": "business_hours"},
+    {"user_input": "Are you open on Sunday?", "intent": "business_hours"},
+    {"user_input": "Hi there", "intent": "general"},
+    {"user_input": "Can I speak to a manager?", "intent": "general"},
+    {"user_input": "Do you deliver?", "intent": "general"},
+]
+
+
+def load_corpus(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield {"user_input": entry.get("user_input", ""), "intent": entry.get("intent") or "general"}
+
+
+async def replay(corpus) -> None:
+    executor = ToolExecutor()
+    responder = TemplateResponder()
+    served = Counter()
+    render_seconds = 0.0
+    for turn in corpus:
+        intent = turn["intent"]
+        tool_results = []
+        if intent in INTENT_TOOLS:
+            name = INTENT_TOOLS[intent]
+            tool_results.append({name: await executor.execute(name, {})})
+        start = time.perf_counter()
+        response = responder.respond(intent, turn["user_input"], tool_results)
+        render_seconds += time.perf_counter() - start
+        served["template" if response is not None else "llm"] += 1
+        served[f"{intent}:{'template' if response is not None else 'llm'}"] += 1
+
+    total = served["template"] + served["llm"]
+    print(f"turns: {total}")
+    print(f"served without response LLM: {served['template']} ({served['template'] / total:.0%})")
+    print(f"mean template render: {render_seconds / total * 1e6:.1f} us")
+    for key in sorted(k for k in served if ":" in k):
+        print(f"  {key}: {served[key]}")
+
+
+def main() -> None:
+    corpus = list(load_corpus(sys.argv[1])) if len(sys.argv) > 1 else SAMPLE_CORPUS
+    asyncio.run(replay(corpus))
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,10 @@ class ToolExecutor(ToolInterface):
 
         tool = self.registered_tools[tool_name]
         try:
-            if asyncio.iscoroutinefunction(tool):
+            if hasattr(tool, "ainvoke"):
+                # LangChain tools take their arguments as a single input dict
+                result = await tool.ainvoke(parameters)
+            elif asyncio.iscoroutinefunction(tool):
                 result = await tool(**parameters)
             else:
                 loop = asyncio.get_event_loop()
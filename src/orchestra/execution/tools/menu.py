@@ -1,23 +1,28 @@
 from langchain_core.tools import tool
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from ...knowledge.menu_service import load_menu
 
 
 @tool
 def get_menu() -> Dict[str, Any]:
     """Return the current menu"""
-    # TODO: Load menu from data store
-    return {"menu": "TODO: Implement menu retrieval"}
+    return load_menu()
 
 
 @tool
 def search_menu_item(item: str) -> Dict[str, Any]:
     """Search for a menu item"""
-    # TODO: Implement search logic
+    query = item.strip().lower()
+    for category, entries in load_menu().items():
+        for entry in entries:
+            if entry["name"].lower() == query:
+                return {"item": item, "found": True, "category": category, **entry}
     return {"item": item, "found": False}
 
 
 @tool
-def get_business_hours() -> Dict[str, str]:
+def get_business_hours() -> Dict[str, Optional[str]]:
     """Return business hours"""
-    # TODO: Implement business hours retrieval
-    return {"hours": "TODO: Implement business hours"}
+    # TODO: Implement business hours retrieval; None means not configured
+    return {"hours": None}
@@ -1,5 +1,13 @@
 """Knowledge layer with centralized data access utilities."""
 
 from .menu_service import MenuService, load_menu
+from .retrieval import HashingEmbedder, MenuSource, TextFileSource, VectorIndex
 
-__all__ = ["MenuService", "load_menu"]
+__all__ = [
+    "MenuService",
+    "load_menu",
+    "HashingEmbedder",
+    "MenuSource",
+    "TextFileSource",
+    "VectorIndex",
+]
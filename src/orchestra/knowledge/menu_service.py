@@ -13,6 +13,11 @@ class MenuService(KnowledgeInterface):
     def __init__(self) -> None:
         self._menu_file = Path(__file__).resolve().parent / "menu" / "restaurant_menu.json"
 
+    @property
+    def menu_file(self) -> Path:
+        """Path of the packaged menu JSON file."""
+        return self._menu_file
+
     def load_menu(self) -> Dict[str, Any]:
         """Load the restaurant menu from the packaged JSON file."""
         with self._menu_file.open("r", encoding="utf-8") as f:
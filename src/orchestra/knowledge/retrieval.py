@@ -0,0 +1,342 @@
+"""Vector retrieval over knowledge sources.
+
+Sources (the menu, FAQ text files, ...) are split into chunks, embedded in
+batches by a pluggable ``Embedder``, and stored as one float32 matrix of
+unit vectors in ``vectors-<generation>.npy``, next to a ``chunks.json`` manifest.  The
+matrix is opened with ``mmap_mode="r"`` so every worker process shares the
+same pages.  Search is a single matrix product followed by a partial sort,
+batched over queries.
+
+Rebuilds are incremental.  A source whose fingerprint is unchanged keeps
+its rows, and inside a changed source any chunk with unchanged text reuses
+its previous vector.  Builds from different processes are serialized by a
+lock file.  New files are written next to the old ones and swapped in with
+``os.replace``, so readers holding the previous mapping are unaffected.
+Readers pick up the new generation on ``refresh``.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .menu_service import MenuService
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_GENERATION_PATTERN = re.compile(r"vectors-(\d+)\.npy")
+
+
+@dataclass
+class Chunk:
+    id: str
+    source: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+# Sources
+
+
+class KnowledgeSource(ABC):
+    """A named body of knowledge that can be split into chunks."""
+
+    name: str
+
+    @abstractmethod
+    def chunks(self) -> List[Chunk]:
+        pass
+
+    def fingerprint(self) -> str:
+        """Content hash; the source is re-chunked only when this changes."""
+        return _digest("\n".join(chunk.text for chunk in self.chunks()))
+
+
+class MenuSource(KnowledgeSource):
+    """One chunk per menu item plus one listing chunk per category."""
+
+    name = "menu"
+
+    def __init__(self, service: Optional[MenuService] = None):
+        self.service = service or MenuService()
+
+    def chunks(self) -> List[Chunk]:
+        chunks = []
+        for category, items in self.service.load_menu().items():
+            names = ", ".join(item["name"] for item in items)
+            chunks.append(
+                Chunk(f"menu:{category}", self.name, f"{category}: {names}", {"category": category})
+            )
+            for item in items:
+                text = f"{item['name']} ({category}, ${item['price']:.2f}): {item['description']}"
+                chunks.append(
+                    Chunk(
+                        f"menu:{category}:{item['name']}",
+                        self.name,
+                        text,
+                        {"category": category, "item": item["name"], "price": item["price"]},
+                    )
+                )
+        return chunks
+
+
+class TextFileSource(KnowledgeSource):
+    """Plain text (e.g. an FAQ) split into paragraph chunks of bounded size."""
+
+    def __init__(self, path: str, name: Optional[str] = None, max_chars: int = 800):
+        self.path = Path(path)
+        self.name = name or self.path.stem
+        self.max_chars = max_chars
+
+    def fingerprint(self) -> str:
+        return _digest(self.path.read_text(encoding="utf-8"))
+
+    def chunks(self) -> List[Chunk]:
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", self.path.read_text(encoding="utf-8"))]
+        chunks: List[Chunk] = []
+        current = ""
+        for paragraph in filter(None, paragraphs):
+            if current and len(current) + len(paragraph) + 1 > self.max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append(current)
+        return [Chunk(f"{self.name}:{i}", self.name, text) for i, text in enumerate(chunks)]
+
+
+# Embedders
+
+
+class Embedder(ABC):
+    """Maps texts to a ``(len(texts), dim)`` float32 array."""
+
+    name: str
+    dim: int
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        pass
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic local embedder using hashed unigrams and bigrams.
+
+    Needs no network or model files, which makes it suitable for tests and
+    development.  Similarity is lexical only.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _bucket(self, feature: str) -> int:
+        return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little") % self.dim
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_PATTERN.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                vectors[row, self._bucket(feature)] += 1.0
+        return vectors
+
+
+class OpenAIEmbedder(Embedder):
+    """Embeddings from the OpenAI API, requested in batches."""
+
+    def __init__(self, client: Any, model: str = "text-embedding-3-small", dim: int = 1536, batch_size: int = 256):
+        self.client = client
+        self.model = model
+        self.dim = dim
+        self.batch_size = batch_size
+        self.name = f"openai-{model}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            batch = list(texts[start:start + self.batch_size])
+            response = self.client.embeddings.create(model=self.model, input=batch)
+            for offset, item in enumerate(response.data):
+                vectors[start + offset] = item.embedding
+        return vectors
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+# Index
+
+
+class VectorIndex:
+    """Persisted, memory-mapped matrix of chunk embeddings."""
+
+    MANIFEST_FILE = "chunks.json"
+    LOCK_FILE = ".lock"
+
+    def __init__(self, directory: str, embedder: Optional[Embedder] = None, batch_size: int = 256):
+        self.directory = Path(directory)
+        self.embedder = embedder or HashingEmbedder()
+        self.batch_size = batch_size
+        self.generation = -1
+        self.chunks: List[Chunk] = []
+        self.vectors: np.ndarray = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._manifest: Dict[str, Any] = {}
+        self._manifest_signature: Optional[Tuple[int, int, int]] = None
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def refresh(self) -> bool:
+        """Reopen the index if another process has written a newer generation."""
+        manifest_path = self.directory / self.MANIFEST_FILE
+        for attempt in range(3):
+            try:
+                stat = manifest_path.stat()
+            except FileNotFoundError:
+                return False
+            # Every write swaps in a new file, so an unchanged inode, size and
+            # mtime means an unchanged manifest; skip reading and parsing it.
+            signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            if signature == self._manifest_signature:
+                return False
+            with manifest_path.open("r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest["generation"] == self.generation:
+                self._manifest_signature = signature
+                return False
+            vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+            try:
+                if manifest["chunks"]:
+                    vectors = np.load(self.directory / manifest["vectors_file"], mmap_mode="r")
+            except FileNotFoundError:
+                # Superseded twice between reading the manifest and opening
+                # its vectors; the manifest on disk is newer now.
+                if attempt == 2:
+                    raise
+                continue
+            self._manifest = manifest
+            self._manifest_signature = signature
+            self.generation = manifest["generation"]
+            self.chunks = [Chunk(**chunk) for chunk in manifest["chunks"]]
+            self.vectors = vectors
+            return True
+        return False
+
+    def is_stale(self, sources: Iterable[KnowledgeSource]) -> bool:
+        """Whether any source (or the embedder) differs from the last build."""
+        self.refresh()
+        if self._manifest.get("embedder") != self.embedder.name:
+            return True
+        return self._manifest.get("sources", {}) != {source.name: source.fingerprint() for source in sources}
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Exclusive lock serializing builds across processes."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with (self.directory / self.LOCK_FILE).open("a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def build(self, sources: Iterable[KnowledgeSource]) -> Dict[str, int]:
+        """(Re)build the index, re-embedding only chunks whose text changed."""
+        with self._lock():
+            # Another worker may have built while we waited for the lock.
+            self.refresh()
+            same_embedder = self._manifest.get("embedder") == self.embedder.name
+            previous_sources = self._manifest.get("sources", {}) if same_embedder else {}
+            sources = list(sources)
+            fingerprints = {source.name: source.fingerprint() for source in sources}
+            if same_embedder and fingerprints == previous_sources:
+                return {"chunks": len(self.chunks), "embedded": 0, "reused": len(self.chunks)}
+
+            previous_rows: Dict[str, int] = {}
+            if same_embedder:
+                previous_rows = {_digest(chunk.text): row for row, chunk in enumerate(self.chunks)}
+            chunks: List[Chunk] = []
+            for source in sources:
+                if previous_sources.get(source.name) == fingerprints[source.name]:
+                    chunks.extend(c for c in self.chunks if c.source == source.name)
+                else:
+                    chunks.extend(source.chunks())
+
+            vectors = np.zeros((len(chunks), self.embedder.dim), dtype=np.float32)
+            missing: List[int] = []
+            for row, chunk in enumerate(chunks):
+                old_row = previous_rows.get(_digest(chunk.text))
+                if old_row is None:
+                    missing.append(row)
+                else:
+                    vectors[row] = self.vectors[old_row]
+            for start in range(0, len(missing), self.batch_size):
+                rows = missing[start:start + self.batch_size]
+                vectors[rows] = _normalize(self.embedder.embed([chunks[row].text for row in rows]))
+
+            self._write(chunks, vectors, fingerprints)
+            self.refresh()
+        return {"chunks": len(chunks), "embedded": len(missing), "reused": len(chunks) - len(missing)}
+
+    def _write(self, chunks: List[Chunk], vectors: np.ndarray, fingerprints: Dict[str, str]) -> None:
+        """Write the next generation; callers hold ``_lock``."""
+        generation = self.generation + 1
+        suffix = f"{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        vectors_name = f"vectors-{generation}.npy"
+        tmp_vectors = self.directory / f".{vectors_name}.{suffix}"
+        with tmp_vectors.open("wb") as f:
+            np.save(f, vectors)
+        os.replace(tmp_vectors, self.directory / vectors_name)
+
+        manifest = {
+            "generation": generation,
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "vectors_file": vectors_name,
+            "sources": fingerprints,
+            "chunks": [asdict(chunk) for chunk in chunks],
+        }
+        tmp_manifest = self.directory / f".{self.MANIFEST_FILE}.{suffix}"
+        with tmp_manifest.open("w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_manifest, self.directory / self.MANIFEST_FILE)
+
+        # The previous generation is kept for readers that have read the old
+        # manifest but not yet opened its vectors.  Anything older is removed;
+        # on POSIX, mappings that are still open keep their data.
+        for old in self.directory.glob("vectors-*.npy"):
+            match = _GENERATION_PATTERN.fullmatch(old.name)
+            if match and int(match.group(1)) < generation - 1:
+                old.unlink()
+
+    def search(self, queries: Sequence[str], k: int = 3) -> List[List[Tuple[Chunk, float]]]:
+        """Top-``k`` chunks by cosine similarity for each query."""
+        if not self.chunks or not queries:
+            return [[] for _ in queries]
+        query_vectors = _normalize(self.embedder.embed(list(queries)))
+        scores = query_vectors @ np.asarray(self.vectors).T
+        k = min(k, len(self.chunks))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-scores[row, candidates])]
+            results.append([(self.chunks[i], float(scores[row, i])) for i in ordered])
+        return results
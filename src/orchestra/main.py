@@ -1,13 +1,14 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
-import asyncio
+import time
 
 # Import architecture components
 from .interfaces import Message, MessageType, ConversationState
 from .orchestration.langgraph_orchestrator import LangGraphOrchestrator
 from .persistence.session_manager import SessionManager
 from .persistence.logging_service import LoggingService
+from .persistence.archive import ConversationArchive
 from .voice.webhook_handler import VoiceWebhookHandler
 from .settings import settings
 
@@ -38,9 +39,20 @@ app = FastAPI(
 orchestrator = LangGraphOrchestrator()
 session_manager = SessionManager()
 logging_service = LoggingService()
+conversation_archive = ConversationArchive()
 voice_handler = VoiceWebhookHandler()
 
 
+@app.on_event("startup")
+async def start_archive():
+    await conversation_archive.start()
+
+
+@app.on_event("shutdown")
+async def stop_archive():
+    await conversation_archive.stop()
+
+
 @app.post("/webhook/voice", response_model=VoiceResponse)
 async def handle_voice_webhook(
     request: VoiceRequest,
@@ -53,7 +65,7 @@ async def handle_voice_webhook(
             type=MessageType.USER_INPUT,
             content=request.message,
             session_id=request.session_id,
-            timestamp=asyncio.get_event_loop().time(),
+            timestamp=time.time(),
             metadata=request.metadata
         )
 
@@ -77,6 +89,7 @@ async def handle_voice_webhook(
             logging_service.log_interaction,
             {
                 "session_id": request.session_id,
+                "tenant_id": request.metadata.get("tenant_id"),
                 "user_input": request.message,
                 "ai_response": response_text,
                 "intent": updated_state.current_intent
@@ -92,6 +105,23 @@ async def handle_voice_webhook(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/sessions/{session_id}/end")
+async def end_session(session_id: str, tenant_id: Optional[str] = None):
+    """Archive a finished call and drop its live session state"""
+    state = await session_manager.get_session(session_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    # The live session is only dropped once its archive write has committed.
+    queued = conversation_archive.archive(
+        state,
+        tenant_id=tenant_id,
+        on_archived=lambda: session_manager.delete_session(session_id),
+    )
+    if not queued:
+        raise HTTPException(status_code=503, detail="Archive queue is full")
+    return {"session_id": session_id, "queued": True}
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -100,10 +130,16 @@ async def health_check():
         "environment": settings.environment,
         "services": {
             "orchestration": "ready",
-            "persistence": "ready",
+            "persistence": "degraded" if session_manager.degraded else "ready",
             "voice": "ready"
         }
     }
 
 
+@app.get("/metrics/sessions")
+async def session_metrics():
+    """Session cache hit-rate and Redis resync metrics"""
+    return session_manager.stats()
+
+
 # Keep existing endpoints from current app.py if they exist
@@ -1,6 +1,6 @@
 """Agent implementations used by the orchestration layer."""
 
+from .entity_extractor import MenuEntityExtractor, OrderItem, ParseResult
 from .parser_agent import ParserAgent
 
-__all__ = ["ParserAgent"]
-
+__all__ = ["ParserAgent", "MenuEntityExtractor", "OrderItem", "ParseResult"]
@@ -0,0 +1,398 @@
+"""Menu-aware order extraction without an LLM.
+
+Menu item names and aliases are compiled into an Aho-Corasick automaton over
+word tokens.  A single left-to-right pass over a transcript finds every item
+mention (longest match wins on overlap).  Quantities are read from number
+words or digits just before an item (or ``times two`` / ``x2`` just after
+it), and modifiers from ``with``/``without``/``no``/``extra`` phrases that
+follow it.  An order cue needs an order verb or explicit quantity, and no
+question ("do you have ...") or negation ("remove the ...").  Swaps and
+corrections ("instead of", "make that three") get low confidence.
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|,")
+
+NUMBER_WORDS: Dict[str, int] = {
+    "a": 1, "an": 1, "one": 1, "single": 1, "two": 2, "couple": 2, "pair": 2,
+    "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "dozen": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19, "twenty": 20,
+    "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60, "seventy": 70,
+    "eighty": 80, "ninety": 90, "hundred": 100,
+}
+TENS = {"twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"}
+# Words that multiply what precedes them ("two dozen", "a couple").
+MULTIPLIERS = {"couple", "pair", "dozen", "hundred"}
+# Tokens allowed between a quantity and the item it counts ("two orders of").
+QUANTITY_FILLERS = {"of", "the", "order", "orders", "more", "x"}
+MODIFIER_WORDS = {"with", "without", "no", "extra", "add", "light", "hold"}
+MODIFIER_STOPS = {",", "and", "please", "also", "plus", "then", "for", "to"}
+ORDER_CUES = {"order", "get", "have", "want", "like", "take", "give", "add", "grab", "i'll", "i'd"}
+QUESTION_CUES = {"how", "what", "which", "does", "price", "cost", "costs"}
+# Auxiliaries that make a question when they open a clause ("do you have",
+# "is there").  Request auxiliaries followed by a person and an order verb
+# ("can I get", "could you add") are orders, not questions.
+CLAUSE_QUESTION_CUES = {"do", "is", "are", "can", "could", "may", "there", "any", "have"}
+REQUEST_AUXILIARIES = {"can", "could", "may"}
+CLAUSE_BREAKS = {",", "and", "so", "also", "but", "oh", "um", "uh", "hi", "hey", "okay", "ok", "well"}
+NEGATION_CUES = {"not", "never", "dont", "cancel", "remove", "delete", "anymore", "off"}
+ARTICLES = {"a", "an"}
+# Swaps, choices and corrections ("instead of", "or", "make that three")
+# change an earlier order rather than add to it, so they go to the LLM.
+CORRECTION_CUES = {"instead", "or", "rather", "change", "swap", "switch", "replace", "actually"}
+CORRECTION_PHRASES = {("make", "that"), ("make", "it")}
+# Confidence for items that cannot be ordered without the LLM resolving them.
+AMBIGUOUS_CONFIDENCE = 0.4
+# Trailing words dropped to form short aliases ("gyro platter" -> "gyro").
+GENERIC_SUFFIXES = {"platter", "plate", "wrap", "bowl", "sandwich", "combo", "meal"}
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _is_question(tokens: List[str]) -> bool:
+    """Questions about items ("how much is", "do you have", "is there")."""
+    for index, token in enumerate(tokens):
+        if token in QUESTION_CUES:
+            return True
+        if token in CLAUSE_QUESTION_CUES and (index == 0 or tokens[index - 1] in CLAUSE_BREAKS):
+            request = tokens[index + 1:index + 3]
+            if (
+                token in REQUEST_AUXILIARIES
+                and len(request) == 2
+                and request[0] in {"i", "we", "you"}
+                and request[1] in ORDER_CUES
+            ):
+                continue
+            return True
+    return False
+
+
+def _is_negated(tokens: List[str]) -> bool:
+    """Negations and removals ("don't want", "no more", "remove the ...")."""
+    for index, token in enumerate(tokens):
+        if token in NEGATION_CUES or token.endswith("n't"):
+            return True
+        if token == "no" and tokens[index + 1:index + 2] in (["more"], ["longer"]):
+            return True
+    return False
+
+
+def _is_correction(tokens: List[str]) -> bool:
+    return any(token in CORRECTION_CUES for token in tokens) or any(
+        pair in CORRECTION_PHRASES for pair in zip(tokens, tokens[1:])
+    )
+
+
+def _plural(word: str) -> str:
+    if word.endswith(("s", "x", "ch", "sh")):
+        return word + "es"
+    if word.endswith("y") and len(word) > 1 and word[-2] not in "aeiou":
+        return word[:-1] + "ies"
+    return word + "s"
+
+
+@dataclass
+class OrderItem:
+    item: str
+    quantity: int
+    modifiers: List[str] = field(default_factory=list)
+    confidence: float = 1.0
+    candidates: List[str] = field(default_factory=list)
+    span: Tuple[int, int] = (0, 0)
+
+
+@dataclass
+class ParseResult:
+    text: str
+    items: List[OrderItem] = field(default_factory=list)
+    order_cue: bool = False
+
+    @property
+    def confidence(self) -> float:
+        """Lowest item confidence, or 0.0 when nothing was recognised."""
+        return min((item.confidence for item in self.items), default=0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": [
+                {
+                    "item": i.item,
+                    "quantity": i.quantity,
+                    "modifiers": i.modifiers,
+                    "confidence": i.confidence,
+                    "candidates": i.candidates,
+                }
+                for i in self.items
+            ],
+            "order_cue": self.order_cue,
+            "confidence": self.confidence,
+        }
+
+
+class TokenAutomaton:
+    """Aho-Corasick automaton whose alphabet is word tokens."""
+
+    def __init__(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, Any]]] = [[]]
+
+    def add(self, pattern: Tuple[str, ...], value: Any) -> None:
+        state = 0
+        for token in pattern:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(pattern), value))
+
+    def compile(self) -> None:
+        """Compute failure links breadth-first; root children fail to root."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(token, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def find(self, tokens: List[str]) -> List[Tuple[int, int, Any]]:
+        """All ``(start, end, value)`` matches, end exclusive."""
+        matches = []
+        state = 0
+        for index, token in enumerate(tokens):
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for length, value in self._output[state]:
+                matches.append((index + 1 - length, index + 1, value))
+        return matches
+
+
+class MenuEntityExtractor:
+    """Extract ``(item, quantity, modifiers)`` from a transcript for one menu."""
+
+    def __init__(self, menu: Dict[str, Any], aliases: Optional[Dict[str, Iterable[str]]] = None):
+        patterns: Dict[Tuple[str, ...], Set[str]] = {}
+        exact: Set[Tuple[str, ...]] = set()
+
+        def register(phrase: str, name: str) -> Tuple[str, ...]:
+            pattern = tuple(tokenize(phrase))
+            if pattern:
+                patterns.setdefault(pattern, set()).add(name)
+            return pattern
+
+        for items in menu.values():
+            for entry in items:
+                name = entry["name"]
+                full = register(name, name)
+                exact.add(full)
+                if full:
+                    register(" ".join(full[:-1] + (_plural(full[-1]),)), name)
+                    if len(full) > 1 and full[-1] in GENERIC_SUFFIXES:
+                        head = full[:-1]
+                        register(" ".join(head), name)
+                        register(" ".join(head[:-1] + (_plural(head[-1]),)), name)
+                for alias in entry.get("aliases", []):
+                    register(alias, name)
+                for alias in (aliases or {}).get(name, []):
+                    register(alias, name)
+
+        self.automaton = TokenAutomaton()
+        for pattern, names in patterns.items():
+            self.automaton.add(pattern, (tuple(sorted(names)), pattern in exact))
+        self.automaton.compile()
+
+    def extract(self, text: str) -> ParseResult:
+        tokens = tokenize(text)
+        result = ParseResult(text=text)
+
+        # Keep the longest match at each position, dropping overlaps.  A short
+        # alias right after a modifier word ("with chicken") is a modifier.
+        spans = []
+        last_end = -1
+        for start, end, value in sorted(
+            self.automaton.find(tokens), key=lambda m: (m[0], -(m[1] - m[0]))
+        ):
+            if not value[1] and start and tokens[start - 1] in MODIFIER_WORDS:
+                continue
+            if start >= last_end:
+                spans.append((start, end, value))
+                last_end = end
+
+        question = _is_question(tokens)
+        covered = {index for start, end, _ in spans for index in range(start, end)}
+        correction = _is_correction([t for i, t in enumerate(tokens) if i not in covered])
+        has_quantity = False
+        for position, (start, end, (names, is_exact)) in enumerate(spans):
+            next_start = spans[position + 1][0] if position + 1 < len(spans) else len(tokens)
+            previous_end = spans[position - 1][1] if position else 0
+            quantity, explicit, certain = self._quantity(
+                tokens, previous_end, start, end, next_start, question
+            )
+            confidence = 1.0 if is_exact else 0.85
+            if len(names) > 1 or not certain or correction:
+                confidence = AMBIGUOUS_CONFIDENCE
+            if not explicit:
+                confidence *= 0.9
+            result.items.append(
+                OrderItem(
+                    item=names[0],
+                    quantity=quantity,
+                    modifiers=self._modifiers(tokens, end, next_start),
+                    confidence=round(confidence, 3),
+                    candidates=list(names) if len(names) > 1 else [],
+                    span=(start, end),
+                )
+            )
+            has_quantity = has_quantity or explicit
+
+        # An explicit quantity ("two gyros") signals an order as much as a verb
+        # does, unless the utterance asks about or takes back the item.
+        result.order_cue = (
+            (has_quantity or any(t in ORDER_CUES for t in tokens))
+            and not question
+            and not _is_negated(tokens)
+        )
+        return result
+
+    @staticmethod
+    def _number(token: str) -> Optional[int]:
+        if token.isdigit():
+            return int(token)
+        return NUMBER_WORDS.get(token)
+
+    @staticmethod
+    def _parse_number(words: List[str]) -> Optional[int]:
+        """Value of a run like ``twenty one`` or ``two hundred``; ``None`` if malformed."""
+        total = current = 0
+        last = None
+        for word in words:
+            value = int(word) if word.isdigit() else NUMBER_WORDS[word]
+            if word in MULTIPLIERS:
+                if last == "multiplier":
+                    return None
+                current = (current or 1) * value
+                if word == "hundred":
+                    total, current, last = total + current, 0, "hundred"
+                else:
+                    last = "multiplier"
+            elif last == "multiplier" or last == "unit" or (last == "tens" and (word in TENS or value >= 10)):
+                return None
+            elif word in ARTICLES and last is not None:
+                return None
+            else:
+                current += value
+                last = "tens" if word in TENS else "unit"
+        return total + current
+
+    def _number_run(self, tokens, start: int, stop: int, step: int) -> List[str]:
+        """Consecutive number tokens from ``start`` towards ``stop``, in text order.
+
+        ``and`` is kept between ``hundred`` and a number ("one hundred and five").
+        """
+        run = []
+        index = start
+        while index != stop:
+            token = tokens[index]
+            if token == "and":
+                before, after = index - 1, index + 1
+                if not (
+                    index + step != stop
+                    and before >= 0
+                    and after < len(tokens)
+                    and tokens[before] == "hundred"
+                    and self._number(tokens[after]) is not None
+                ):
+                    break
+            elif self._number(token) is None:
+                break
+            run.append(token)
+            index += step
+        return run[::step]
+
+    def _run_quantity(self, run: List[str]) -> Tuple[int, bool]:
+        """``(quantity, certain)``; an unparseable run keeps its last word at low certainty."""
+        number = self._parse_number([word for word in run if word != "and"])
+        if number is None:
+            return self._number(run[-1]), False
+        return number, True
+
+    def _quantity(self, tokens, previous_end, start, end, next_start, question=False) -> Tuple[int, bool, bool]:
+        """``(quantity, explicit, certain)`` for the item at ``tokens[start:end]``.
+
+        An explicit trailing quantity ("a baklava x2") overrides a leading
+        article; two different explicit quantities leave the result uncertain.
+        """
+        leading = None
+        index = start - 1
+        while index >= previous_end and tokens[index] in QUANTITY_FILLERS:
+            index -= 1
+        if index >= previous_end:
+            run = self._number_run(tokens, index, previous_end - 1, -1)
+            if run:
+                number, certain = self._run_quantity(run)
+                if run == ["dozen"] and index - 1 >= previous_end and tokens[index - 1] == "half":
+                    number = 6
+                # "is there a gyro" asks about one; it does not order one.
+                leading = (number, not (question and run[-1] in ARTICLES), certain, run in (["a"], ["an"]))
+
+        trailing = None
+        following = tokens[end:next_start]
+        if len(following) >= 2 and following[0] in {"times", "x"}:
+            run = self._number_run(tokens, end + 1, next_start, 1)
+            if run:
+                number, certain = self._run_quantity(run)
+                trailing = (number, True, certain)
+        elif following and re.fullmatch(r"x\d+", following[0]):
+            trailing = (int(following[0][1:]), True, True)
+
+        if leading and trailing:
+            number, explicit, certain, article = leading
+            if article or number == trailing[0]:
+                return trailing
+            return trailing[0], True, False
+        if leading:
+            return leading[:3]
+        if trailing:
+            return trailing
+        return 1, False, True
+
+    @staticmethod
+    def _modifiers(tokens, end, next_start) -> List[str]:
+        modifiers: List[str] = []
+        index = end
+        while index < next_start:
+            if tokens[index] in MODIFIER_WORDS:
+                words = [tokens[index]]
+                index += 1
+                while (
+                    index < next_start
+                    and tokens[index] not in MODIFIER_STOPS
+                    and tokens[index] not in MODIFIER_WORDS
+                ):
+                    words.append(tokens[index])
+                    index += 1
+                if len(words) > 1:
+                    modifiers.append(" ".join(words))
+                continue
+            if tokens[index] in MODIFIER_STOPS - {","}:
+                if tokens[index] != "and" or index + 1 >= next_start or tokens[index + 1] not in MODIFIER_WORDS:
+                    break
+            index += 1
+        return modifiers
@@ -1,6 +1,49 @@
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ...knowledge.menu_service import MenuService
+from .entity_extractor import MenuEntityExtractor, ParseResult
+
+
 class ParserAgent:
-    """Agent responsible for parsing user requests."""
+    """Agent responsible for parsing user requests.
+
+    Orders are extracted locally by a per-tenant ``MenuEntityExtractor``.
+    ``menu_provider`` returns the menu for a tenant.  The extractor is only
+    rebuilt when that menu's content changes.  Returning the same dict
+    object again skips even the content check.
+    """
+
+    def __init__(self, menu_provider: Optional[Callable[[Optional[str]], Dict[str, Any]]] = None):
+        self.menu_provider = menu_provider or self._packaged_menu
+        self._menu_service = MenuService()
+        self._menu: Dict[str, Any] = {}
+        self._menu_mtime: Optional[int] = None
+        self._extractors: Dict[Optional[str], Tuple[Dict[str, Any], str, MenuEntityExtractor]] = {}
+
+    def _packaged_menu(self, tenant_id: Optional[str]) -> Dict[str, Any]:
+        """Packaged menu, reloaded only when the file is modified"""
+        mtime = os.stat(self._menu_service.menu_file).st_mtime_ns
+        if mtime != self._menu_mtime:
+            self._menu = self._menu_service.load_menu()
+            self._menu_mtime = mtime
+        return self._menu
+
+    def _extractor(self, tenant_id: Optional[str]) -> MenuEntityExtractor:
+        menu = self.menu_provider(tenant_id)
+        cached = self._extractors.get(tenant_id)
+        if cached is not None and cached[0] is menu:
+            return cached[2]
+        fingerprint = hashlib.sha1(json.dumps(menu, sort_keys=True).encode("utf-8")).hexdigest()
+        if cached is not None and cached[1] == fingerprint:
+            extractor = cached[2]
+        else:
+            extractor = MenuEntityExtractor(menu)
+        self._extractors[tenant_id] = (menu, fingerprint, extractor)
+        return extractor
 
-    def parse(self, text: str) -> str:
-        """Placeholder parse method."""
-        return text
+    def parse(self, text: str, tenant_id: Optional[str] = None) -> ParseResult:
+        """Extract ordered items, quantities and modifiers from ``text``."""
+        return self._extractor(tenant_id).extract(text)
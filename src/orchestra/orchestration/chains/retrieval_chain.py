@@ -1,6 +1,48 @@
+import os
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from ...knowledge.retrieval import Chunk, KnowledgeSource, MenuSource, VectorIndex
+
+
 class RetrievalChain:
     """Chain responsible for retrieving information."""
 
+    def __init__(
+        self,
+        index: Optional[VectorIndex] = None,
+        sources: Optional[Iterable[KnowledgeSource]] = None,
+        k: int = 3,
+        check_interval: Optional[float] = None,
+    ):
+        self.index = index if index is not None else VectorIndex(
+            os.getenv("RETRIEVAL_INDEX_DIR", "data/retrieval_index")
+        )
+        self.sources = list(sources) if sources is not None else [MenuSource()]
+        self.k = k
+        # Checking for a newer generation or changed sources costs file I/O,
+        # so queries between checks go straight to the mapped index.
+        self.check_interval = (
+            check_interval
+            if check_interval is not None
+            else float(os.getenv("RETRIEVAL_CHECK_INTERVAL", "30"))
+        )
+        self._next_check = 0.0
+
+    def rebuild(self) -> None:
+        """Re-embed any sources that changed since the last build."""
+        self.index.build(self.sources)
+
+    def search(self, queries: List[str], k: Optional[int] = None) -> List[List[Tuple[Chunk, float]]]:
+        """Top-k chunks for a batch of queries."""
+        now = time.monotonic()
+        if now >= self._next_check or not len(self.index):
+            self._next_check = now + self.check_interval
+            # is_stale also picks up generations written by other workers.
+            if self.index.is_stale(self.sources):
+                self.rebuild()
+        return self.index.search(queries, k or self.k)
+
     def run(self, query: str) -> str:
-        """Placeholder run method."""
-        return query
+        """Return the most relevant knowledge for ``query`` as prompt context."""
+        return "\n".join(chunk.text for chunk, _ in self.search([query])[0])
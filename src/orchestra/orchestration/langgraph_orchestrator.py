@@ -1,6 +1,6 @@
 from langgraph.graph import StateGraph, END
 from typing import TypedDict, Dict, Any, List
-import asyncio
+import time
 from openai import OpenAI
 
 from ..interfaces import (
@@ -11,16 +11,22 @@ from ..interfaces import (
 )
 from ..execution.tool_executor import ToolExecutor
 from ..settings import settings
+from .resilience import CircuitBreaker, HedgedLLM
+from .responder import TemplateResponder
+from .agents.parser_agent import ParserAgent
 
 
 class GraphState(TypedDict):
     messages: list
     user_input: str
     intent: str
+    parsed_order: dict
     tool_calls: list
     tool_results: list
     final_response: str
+    responder: str
     session_id: str
+    tenant_id: str
 
 
 class LangGraphOrchestrator(OrchestrationInterface):
@@ -29,9 +35,33 @@ class LangGraphOrchestrator(OrchestrationInterface):
     def __init__(self):
         self.graph = self._build_graph()
         self.tool_executor = ToolExecutor()
+        self.template_responder = TemplateResponder()
+        self.parser = ParserAgent()
         self.client = OpenAI(api_key=settings.orchestration.openai_api_key)
+        config = settings.orchestration
+        # Both call sites hit the same upstream, so they share one breaker but
+        # keep separate latency windows (intent calls are far shorter).
+        self.llm_breaker = CircuitBreaker(
+            failure_threshold=config.circuit_failure_threshold,
+            slow_call_threshold=config.slow_call_threshold,
+            reset_timeout=config.circuit_reset_timeout,
+        )
+        self.intent_llm = self._hedged_llm()
+        self.response_llm = self._hedged_llm()
         # TODO: Add checkpointer for state persistence
 
+    def _hedged_llm(self) -> HedgedLLM:
+        config = settings.orchestration
+        return HedgedLLM(
+            self.client,
+            model=config.model_name,
+            hedge_model=config.hedge_model_name,
+            breaker=self.llm_breaker,
+            hedging=config.hedging_enabled,
+            hedge_percentile=config.hedge_percentile,
+            max_hedge_ratio=config.max_hedge_ratio,
+        )
+
     def _build_graph(self) -> StateGraph:
         """Build the LangGraph state machine"""
         workflow = StateGraph(GraphState)
@@ -40,6 +70,7 @@ class LangGraphOrchestrator(OrchestrationInterface):
         workflow.add_node("intent_parser", self._parse_intent)
         workflow.add_node("tool_selector", self._select_tools)
         workflow.add_node("tool_executor", self._execute_tools)
+        workflow.add_node("template_responder", self._render_template)
         workflow.add_node("response_generator", self._generate_response)
 
         # Define edges
@@ -53,7 +84,15 @@ class LangGraphOrchestrator(OrchestrationInterface):
             }
         )
         workflow.add_edge("tool_selector", "tool_executor")
-        workflow.add_edge("tool_executor", "response_generator")
+        workflow.add_edge("tool_executor", "template_responder")
+        workflow.add_conditional_edges(
+            "template_responder",
+            self._needs_llm_response,
+            {
+                "llm_response": "response_generator",
+                "done": END,
+            }
+        )
         workflow.add_edge("response_generator", END)
 
         return workflow.compile()
@@ -64,13 +103,18 @@ class LangGraphOrchestrator(OrchestrationInterface):
             "messages": [m.model_dump() for m in state.messages] + [message.model_dump()],
             "user_input": message.content,
             "intent": "",
+            "parsed_order": {},
             "tool_calls": [],
             "tool_results": [],
             "final_response": "",
+            "responder": "",
             "session_id": message.session_id,
+            "tenant_id": message.metadata.get("tenant_id", ""),
         }
 
+        started = time.perf_counter()
         result: GraphState = await self.graph.ainvoke(graph_state)
+        latency_ms = (time.perf_counter() - started) * 1000
 
         # update conversation state
         state.messages.append(message)
@@ -78,8 +122,17 @@ class LangGraphOrchestrator(OrchestrationInterface):
             ai_msg = Message(
                 type=MessageType.SYSTEM_RESPONSE,
                 content=result["final_response"],
-                metadata={},
-                timestamp=asyncio.get_event_loop().time(),
+                metadata={
+                    "intent": result.get("intent"),
+                    "latency_ms": latency_ms,
+                    "responder": result.get("responder"),
+                    "tool_calls": [
+                        {"tool_name": name, "success": res.get("success")}
+                        for entry in result.get("tool_results", [])
+                        for name, res in entry.items()
+                    ],
+                },
+                timestamp=time.time(),
                 session_id=message.session_id,
             )
             state.messages.append(ai_msg)
@@ -87,20 +140,25 @@ class LangGraphOrchestrator(OrchestrationInterface):
         return state
 
     async def _parse_intent(self, state: GraphState) -> GraphState:
-        """Parse user intent using an LLM"""
+        """Parse user intent, extracting confident orders locally before using an LLM"""
         user_input = state["user_input"]
+        parsed = self.parser.parse(user_input, state.get("tenant_id") or None)
+        if (
+            parsed.items
+            and parsed.order_cue
+            and parsed.confidence >= settings.orchestration.order_confidence_threshold
+        ):
+            state["intent"] = "place_order"
+            state["parsed_order"] = parsed.to_dict()
+            return state
         try:
-            completion = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
-                    model=settings.orchestration.model_name,
-                    messages=[
-                        {"role": "system", "content": "Classify user intent in one word."},
-                        {"role": "user", "content": user_input},
-                    ],
-                    max_tokens=5,
-                    temperature=settings.orchestration.temperature,
-                ),
+            completion = await self.intent_llm.create(
+                messages=[
+                    {"role": "system", "content": "Classify user intent in one word."},
+                    {"role": "user", "content": user_input},
+                ],
+                max_tokens=5,
+                temperature=settings.orchestration.temperature,
             )
             intent = completion.choices[0].message.content.strip().lower()
         except Exception:
@@ -117,7 +175,7 @@ class LangGraphOrchestrator(OrchestrationInterface):
 
     def _should_use_tools(self, state: GraphState) -> str:
         """Determine if tools are needed"""
-        if state.get("intent") in {"menu_query", "business_hours"}:
+        if state.get("intent") in {"menu_query", "business_hours", "place_order"}:
             return "use_tools"
         return "direct_response"
 
@@ -129,6 +187,17 @@ class LangGraphOrchestrator(OrchestrationInterface):
             tool_calls.append({"tool_name": "get_menu", "parameters": {}})
         elif intent == "business_hours":
             tool_calls.append({"tool_name": "get_business_hours", "parameters": {}})
+        elif intent == "place_order":
+            for entry in state.get("parsed_order", {}).get("items", []):
+                item = entry["item"]
+                if entry["modifiers"]:
+                    item = f"{item} ({', '.join(entry['modifiers'])})"
+                tool_calls.append(
+                    {
+                        "tool_name": "add_order_to_sheet",
+                        "parameters": {"item": item, "quantity": entry["quantity"]},
+                    }
+                )
         state["tool_calls"] = tool_calls
         return state
 
@@ -143,6 +212,26 @@ class LangGraphOrchestrator(OrchestrationInterface):
         state["tool_results"] = results
         return state
 
+    async def _render_template(self, state: GraphState) -> GraphState:
+        """Answer structured intents from tool results without the LLM"""
+        response = self.template_responder.respond(
+            state.get("intent", ""),
+            state["user_input"],
+            state.get("tool_results", []),
+            tool_calls=state.get("tool_calls", []),
+            tenant_id=state.get("tenant_id") or None,
+        )
+        if response is not None:
+            state["final_response"] = response
+            state["responder"] = "template"
+        return state
+
+    def _needs_llm_response(self, state: GraphState) -> str:
+        """Route to the LLM only when no template covered the turn"""
+        if state.get("responder") == "template":
+            return "done"
+        return "llm_response"
+
     async def _generate_response(self, state: GraphState) -> GraphState:
         """Generate final response"""
         tool_context = ""
@@ -150,13 +239,9 @@ class LangGraphOrchestrator(OrchestrationInterface):
             tool_context = str(state["tool_results"])
         prompt = f"User: {state['user_input']}. Tool results: {tool_context}. Respond conversationally."
         try:
-            completion = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
-                    model=settings.orchestration.model_name,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=settings.orchestration.temperature,
-                ),
+            completion = await self.response_llm.create(
+                messages=[{"role": "user", "content": prompt}],
+                temperature=settings.orchestration.temperature,
             )
             response = completion.choices[0].message.content.strip()
         except Exception:
@@ -165,4 +250,5 @@ class LangGraphOrchestrator(OrchestrationInterface):
             else:
                 response = "I'm here to help."
         state["final_response"] = response
+        state["responder"] = "llm"
         return state
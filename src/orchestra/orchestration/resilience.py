@@ -0,0 +1,218 @@
+"""Tail-latency protection for LLM calls.
+
+``HedgedLLM`` wraps a synchronous OpenAI-style client.  If the primary
+request has not returned after a delay derived from recent latencies, it
+sends a duplicate ("hedge") request, optionally to a faster model, and
+returns whichever answer arrives first.  Hedges are capped at
+``max_hedge_ratio`` of calls, so a slow upstream never sees double load.
+A shared ``CircuitBreaker`` stops calling the LLM after sustained errors
+or slow calls.  Callers then get a ``CircuitOpenError`` straight away and
+can use their own fallbacks.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the LLM while the circuit is open."""
+
+
+class LatencyTracker:
+    """Rolling window of call latencies in seconds."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the ``q`` quantile (0-1) of the window, or ``None`` if empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Errors and calls slower than ``slow_call_threshold`` both count as
+    failures.  After ``failure_threshold`` failures in a row the circuit
+    opens for ``reset_timeout`` seconds.  It then lets a single trial call
+    through (half-open); success closes it again, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        slow_call_threshold: float = 10.0,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Return whether a call may be made now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self, latency: float) -> None:
+        if latency > self.slow_call_threshold:
+            self.record_failure()
+            return
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+        self.state = self.CLOSED
+
+    def release(self) -> None:
+        """Free the half-open trial slot after a call ended with no outcome."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = self._clock()
+
+
+class HedgedLLM:
+    """Chat-completion caller with hedged requests and a circuit breaker."""
+
+    def __init__(
+        self,
+        client: Any,
+        model: str,
+        hedge_model: Optional[str] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedging: bool = True,
+        hedge_percentile: float = 0.9,
+        initial_hedge_delay: float = 1.0,
+        min_hedge_delay: float = 0.05,
+        min_samples: int = 20,
+        max_hedge_ratio: float = 0.1,
+    ):
+        self.client = client
+        self.model = model
+        self.hedge_model = hedge_model or model
+        self.breaker = breaker or CircuitBreaker()
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.max_hedge_ratio = max_hedge_ratio
+        self.latencies = LatencyTracker()
+        self.metrics: Dict[str, int] = {
+            "calls": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "errors": 0,
+            "short_circuited": 0,
+        }
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the primary before sending a hedge."""
+        if len(self.latencies) < self.min_samples:
+            return self.initial_hedge_delay
+        return max(self.min_hedge_delay, self.latencies.percentile(self.hedge_percentile))
+
+    def _request(self, model: str, kwargs: Dict[str, Any]) -> Any:
+        return self.client.chat.completions.create(model=model, **kwargs)
+
+    async def create(self, **kwargs: Any) -> Any:
+        """Create a chat completion; raises ``CircuitOpenError`` when open."""
+        if not self.breaker.allow():
+            self.metrics["short_circuited"] += 1
+            raise CircuitOpenError("LLM circuit is open")
+        trial = self.breaker.state == CircuitBreaker.HALF_OPEN
+        self.metrics["calls"] += 1
+
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        try:
+            result = await self._first_result(loop, start, kwargs)
+        except Exception:
+            self.metrics["errors"] += 1
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled before an outcome: give up the half-open trial slot
+            # so the next call can probe the upstream again.
+            if trial:
+                self.breaker.release()
+            raise
+        self.breaker.record_success(loop.time() - start)
+        return result
+
+    def _may_hedge(self) -> bool:
+        return self.hedging and self.metrics["hedges"] < self.max_hedge_ratio * self.metrics["calls"]
+
+    async def _first_result(self, loop: asyncio.AbstractEventLoop, start: float, kwargs: Dict[str, Any]) -> Any:
+        primary = loop.run_in_executor(None, partial(self._request, self.model, kwargs))
+        primary.add_done_callback(partial(self._record_primary, start, loop))
+        pending = {primary}
+
+        if self._may_hedge():
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_delay())
+            if not done and self._may_hedge():
+                hedge = loop.run_in_executor(None, partial(self._request, self.hedge_model, kwargs))
+                hedge.add_done_callback(_consume_exception)
+                pending.add(hedge)
+                self.metrics["hedges"] += 1
+
+        # Losers are left to finish rather than cancelled: the executor thread
+        # runs to completion anyway, and the primary's done callback then
+        # records its real latency.
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is not primary:
+                    self.metrics["hedge_wins"] += 1
+                return future.result()
+        raise error
+
+    def _record_primary(self, start: float, loop: asyncio.AbstractEventLoop, future: asyncio.Future) -> None:
+        # Primary latencies are recorded even when a hedge won, so the hedge
+        # delay tracks the primary model rather than the hedged tail.
+        if not future.cancelled() and future.exception() is None:
+            self.latencies.record(loop.time() - start)
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
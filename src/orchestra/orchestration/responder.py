@@ -0,0 +1,200 @@
+"""Deterministic responses for structured intents.
+
+For intents whose answer is fully contained in ``tool_results`` (business
+hours, menu listings, item details, order confirmations), a format template
+is rendered locally instead of asking the LLM to phrase the data.  Menu
+questions get a template only when they plainly ask for a price, a category
+listing or the menu itself.  Templates are compiled once and can be
+overridden per tenant.  ``respond`` returns ``None`` whenever no template
+covers the results, and the caller then falls back to the LLM.
+"""
+
+import re
+import string
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+DEFAULT_TEMPLATES: Dict[str, str] = {
+    "business_hours": "Our hours are {hours}.",
+    "menu_overview": "We have {categories}. Which would you like to hear about?",
+    "menu_category": "Our {category} are {items}.",
+    "menu_item": "The {name} is ${price:.2f}. {description}",
+    "order_confirmation": "Got it: {order}. Anything else?",
+}
+
+# A menu question is answered from a template only if every word outside the
+# item or category name is one of these; "which appetizers are vegetarian"
+# needs more than a listing, so it goes to the LLM.
+LISTING_WORDS = frozenset(
+    "a all and any anything are can could do else give got have hey hi i is kind kinds "
+    "list me of offer offering on options please s serve sell show so sort sorts tell "
+    "the there today tonight type types um uh we what what's whats which you your".split()
+)
+ITEM_CUES = frozenset("about cost costs describe how in it much price priced prices".split())
+OVERVIEW_WORDS = frozenset("eat food menu".split())
+_WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+class ResponseTemplate:
+    """A ``str.format`` template parsed once up front."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.fields = frozenset(
+            field.split(".")[0].split("[")[0]
+            for _, field, _, _ in string.Formatter().parse(source)
+            if field
+        )
+
+    def render(self, values: Dict[str, Any]) -> Optional[str]:
+        """Render with ``values``; ``None`` if a field is missing or malformed."""
+        if not self.fields.issubset(values):
+            return None
+        try:
+            return self.source.format_map(values)
+        except (ValueError, TypeError, KeyError, IndexError):
+            return None
+
+
+def join_list(items: Iterable[str]) -> str:
+    """Join items for speech: ``a``, ``a and b``, ``a, b and c``."""
+    items = list(items)
+    if len(items) <= 1:
+        return "".join(items)
+    return f"{', '.join(items[:-1])} and {items[-1]}"
+
+
+class TemplateResponder:
+    """Render responses for structured intents from tool results."""
+
+    def __init__(
+        self,
+        templates: Optional[Dict[str, str]] = None,
+        tenant_templates: Optional[Dict[str, Dict[str, str]]] = None,
+    ):
+        self._default = self._compile({**DEFAULT_TEMPLATES, **(templates or {})})
+        self._tenants: Dict[str, Dict[str, ResponseTemplate]] = {}
+        for tenant_id, overrides in (tenant_templates or {}).items():
+            self.register_tenant(tenant_id, overrides)
+
+    @staticmethod
+    def _compile(templates: Dict[str, str]) -> Dict[str, ResponseTemplate]:
+        return {name: ResponseTemplate(source) for name, source in templates.items()}
+
+    def register_tenant(self, tenant_id: str, templates: Dict[str, str]) -> None:
+        """Override some or all templates for one tenant"""
+        self._tenants[tenant_id] = {**self._default, **self._compile(templates)}
+
+    def _templates(self, tenant_id: Optional[str]) -> Dict[str, ResponseTemplate]:
+        return self._tenants.get(tenant_id, self._default) if tenant_id else self._default
+
+    def respond(
+        self,
+        intent: str,
+        user_input: str,
+        tool_results: List[Dict[str, Any]],
+        tool_calls: Optional[List[Dict[str, Any]]] = None,
+        tenant_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """Return a rendered response, or ``None`` if the LLM is needed"""
+        results = _successful_results(tool_results)
+        templates = self._templates(tenant_id)
+        if "add_order_to_sheet" in results:
+            if _any_failed(tool_results, "add_order_to_sheet"):
+                return None
+            orders = [
+                call.get("parameters", {})
+                for call in tool_calls or []
+                if call.get("tool_name") == "add_order_to_sheet"
+            ]
+            return self._order(templates, orders)
+        if intent == "business_hours" and "get_business_hours" in results:
+            return self._hours(templates, results["get_business_hours"])
+        if intent == "menu_query" and "get_menu" in results:
+            return self._menu(templates, user_input, results["get_menu"])
+        return None
+
+    def _order(self, templates, orders: List[Dict[str, Any]]) -> Optional[str]:
+        if not orders or any("item" not in o or "quantity" not in o for o in orders):
+            return None
+        values = {
+            "order": join_list(f"{o['quantity']} x {o['item']}" for o in orders),
+            "customer_name": orders[0].get("customer_name", "Unknown"),
+        }
+        if len(orders) == 1:
+            values.update(item=orders[0]["item"], quantity=orders[0]["quantity"])
+        return templates["order_confirmation"].render(values)
+
+    def _hours(self, templates, result: Any) -> Optional[str]:
+        if not isinstance(result, dict) or not result.get("hours"):
+            return None
+        hours = result["hours"]
+        if isinstance(hours, dict):
+            result = {**result, "hours": join_list(f"{day} {time}" for day, time in hours.items())}
+        return templates["business_hours"].render(result)
+
+    def _menu(self, templates, user_input: str, menu: Any) -> Optional[str]:
+        """Answer plain price, listing and menu requests; anything else is ``None``"""
+        if not isinstance(menu, dict) or not menu:
+            return None
+        if any(not isinstance(items, list) for items in menu.values()):
+            return None
+        words = _WORD_PATTERN.findall(user_input.lower())
+        for items in menu.values():
+            for item in items:
+                if not isinstance(item, dict) or "name" not in item:
+                    continue
+                rest = _without(words, _WORD_PATTERN.findall(str(item["name"]).lower()))
+                if rest is None:
+                    continue
+                if rest.isdisjoint(ITEM_CUES) or not rest <= LISTING_WORDS | ITEM_CUES:
+                    return None
+                return templates["menu_item"].render(item)
+        for category, items in menu.items():
+            name = category.lower()
+            tokens = _WORD_PATTERN.findall(name)
+            rest = _without(words, tokens)
+            if rest is None and tokens:
+                rest = _without(words, tokens[:-1] + [tokens[-1].rstrip("s")])
+            if rest is None:
+                continue
+            if not rest <= LISTING_WORDS:
+                return None
+            return templates["menu_category"].render(
+                {
+                    "category": name,
+                    "items": join_list(
+                        item["name"] for item in items if isinstance(item, dict) and "name" in item
+                    ),
+                }
+            )
+        if not set(words) <= LISTING_WORDS | OVERVIEW_WORDS:
+            return None
+        return templates["menu_overview"].render(
+            {"categories": join_list(c.lower() for c in menu)}
+        )
+
+
+def _without(words: List[str], phrase: List[str]) -> Optional[FrozenSet[str]]:
+    """Words left after removing ``phrase``, or ``None`` if it does not occur"""
+    size = len(phrase)
+    for start in range(len(words) - size + 1):
+        if size and words[start:start + size] == phrase:
+            return frozenset(words[:start] + words[start + size:])
+    return None
+
+
+def _successful_results(tool_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for entry in tool_results:
+        for tool_name, outcome in entry.items():
+            if isinstance(outcome, dict) and outcome.get("success"):
+                results[tool_name] = outcome.get("result")
+    return results
+
+
+def _any_failed(tool_results: List[Dict[str, Any]], tool_name: str) -> bool:
+    return any(
+        not (isinstance(entry[tool_name], dict) and entry[tool_name].get("success"))
+        for entry in tool_results
+        if tool_name in entry
+    )
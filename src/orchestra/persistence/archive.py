@@ -0,0 +1,393 @@
+import asyncio
+import inspect
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, create_engine, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from ..interfaces import ConversationState, MessageType
+from .database.models import Base, IntentRecord, MessageRecord, SessionRecord, ToolCallRecord
+
+
+_QueueItem = Tuple[ConversationState, Optional[str], Optional[Callable[[], Any]]]
+_STOP = object()
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+class ConversationArchive:
+    """Durable SQL archive of finished conversations
+
+    ``archive`` only enqueues the session, so it is safe to call from the
+    request path.  A background task drains the queue and writes sessions in
+    batches, one transaction per batch, on a worker thread.  Failed batches
+    are retried with backoff, and ``on_archived`` callbacks run only once a
+    session's batch has committed.  Sessions whose batch still fails are
+    kept in ``failed`` and put back on the queue every ``requeue_delay``
+    seconds, and once more on ``stop``.  Anything unwritten at shutdown is
+    lost from the archive only; its callback never ran, so the caller's
+    live copy is kept and can be archived again.  Re-archiving a session
+    replaces its previous rows.
+    """
+
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        requeue_delay: float = 60.0,
+    ):
+        self.engine = create_engine(
+            database_url or os.getenv("DATABASE_URL", "sqlite:///orchestra.db")
+        )
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.requeue_delay = requeue_delay
+        self.failed: Dict[str, _QueueItem] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._requeue_handle: Optional[asyncio.TimerHandle] = None
+        self.metrics: Dict[str, int] = {
+            "archived_sessions": 0,
+            "batches": 0,
+            "dropped_sessions": 0,
+            "write_errors": 0,
+            "write_retries": 0,
+            "failed_sessions": 0,
+            "requeued_sessions": 0,
+            "callback_errors": 0,
+        }
+
+    def create_schema(self) -> None:
+        """Create archive tables and indexes if they do not exist"""
+        Base.metadata.create_all(self.engine)
+
+    async def _run(self, func) -> Any:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, func)
+
+    # Writing
+
+    async def start(self) -> None:
+        """Create the schema and start the background writer"""
+        await self._run(self.create_schema)
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.create_task(self._drain())
+
+    async def stop(self) -> None:
+        """Stop the background writer after flushing queued sessions"""
+        if self._worker is not None:
+            # The sentinel lets the worker finish the batch it is collecting.
+            await self._queue.put(_STOP)
+            await self._worker
+            self._worker = None
+        if self._requeue_handle is not None:
+            self._requeue_handle.cancel()
+            self._requeue_handle = None
+        self._requeue()
+        await self.flush()
+
+    def archive(
+        self,
+        state: ConversationState,
+        tenant_id: Optional[str] = None,
+        on_archived: Optional[Callable[[], Any]] = None,
+    ) -> bool:
+        """Queue a finished session for archiving; returns False if dropped
+
+        ``on_archived`` is called (and awaited if it returns an awaitable)
+        after the session has been written.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        # A newer copy supersedes one waiting to be retried.
+        self.failed.pop(state.session_id, None)
+        try:
+            self._queue.put_nowait((state, tenant_id, on_archived))
+        except asyncio.QueueFull:
+            self.metrics["dropped_sessions"] += 1
+            return False
+        return True
+
+    async def flush(self) -> None:
+        """Write everything currently queued"""
+        while self._queue is not None and not self._queue.empty():
+            batch = [self._queue.get_nowait() for _ in range(min(self.batch_size, self._queue.qsize()))]
+            batch = [item for item in batch if item is not _STOP]
+            if batch:
+                await self._write(batch)
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._write(batch)
+            if stopping:
+                return
+
+    async def _write(self, batch: List[_QueueItem]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._run(lambda: self._write_batch(batch))
+                break
+            except Exception:
+                self.metrics["write_errors"] += 1
+                if attempt == self.max_retries:
+                    # Callbacks are skipped, so callers keep their live copy.
+                    self.metrics["failed_sessions"] += len(batch)
+                    for item in batch:
+                        self.failed[item[0].session_id] = item
+                    self._schedule_requeue()
+                    return
+                self.metrics["write_retries"] += 1
+                await asyncio.sleep(self.retry_delay * 2 ** attempt)
+        self.metrics["batches"] += 1
+        self.metrics["archived_sessions"] += len(batch)
+        for _, _, on_archived in batch:
+            if on_archived is None:
+                continue
+            try:
+                result = on_archived()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                self.metrics["callback_errors"] += 1
+
+    def _schedule_requeue(self) -> None:
+        if self._requeue_handle is None and self._worker is not None and self.failed:
+            loop = asyncio.get_event_loop()
+            self._requeue_handle = loop.call_later(self.requeue_delay, self._requeue)
+
+    def _requeue(self) -> None:
+        """Put failed sessions back on the queue, as many as fit"""
+        self._requeue_handle = None
+        for session_id, item in list(self.failed.items()):
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                break
+            del self.failed[session_id]
+            self.metrics["requeued_sessions"] += 1
+        self._schedule_requeue()
+
+    def _write_batch(self, batch: List[_QueueItem]) -> None:
+        rows: Dict[Any, List[Dict[str, Any]]] = {
+            SessionRecord: [],
+            MessageRecord: [],
+            IntentRecord: [],
+            ToolCallRecord: [],
+        }
+        latest = {state.session_id: (state, tenant_id) for state, tenant_id, _ in batch}
+        for state, tenant_id in latest.values():
+            for model, model_rows in self._rows(state, tenant_id).items():
+                rows[model].extend(model_rows)
+
+        session_ids = list(latest)
+        with Session(self.engine) as db, db.begin():
+            for model in (ToolCallRecord, IntentRecord, MessageRecord):
+                db.execute(delete(model).where(model.session_id.in_(session_ids)))
+            db.execute(delete(SessionRecord).where(SessionRecord.id.in_(session_ids)))
+            for model, model_rows in rows.items():
+                if model_rows:
+                    db.execute(insert(model), model_rows)
+
+    def _rows(self, state: ConversationState, tenant_id: Optional[str]) -> Dict[Any, List[Dict[str, Any]]]:
+        session_id = state.session_id
+        messages, intents, tool_calls = [], [], []
+        for seq, message in enumerate(state.messages):
+            created_at = _to_datetime(message.timestamp)
+            messages.append(
+                {
+                    "session_id": session_id,
+                    "seq": seq,
+                    "type": message.type.value,
+                    "content": message.content,
+                    "created_at": created_at,
+                    "metadata_": message.metadata,
+                }
+            )
+            if message.type != MessageType.SYSTEM_RESPONSE:
+                continue
+            if message.metadata.get("intent"):
+                intents.append(
+                    {
+                        "session_id": session_id,
+                        "message_seq": seq,
+                        "intent": message.metadata["intent"],
+                        "created_at": created_at,
+                        "latency_ms": message.metadata.get("latency_ms"),
+                    }
+                )
+            for call in message.metadata.get("tool_calls", []):
+                tool_calls.append(
+                    {
+                        "session_id": session_id,
+                        "message_seq": seq,
+                        "tool_name": call.get("tool_name"),
+                        "success": call.get("success"),
+                        "created_at": created_at,
+                    }
+                )
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        started_at = messages[0]["created_at"] if messages else now
+        ended_at = messages[-1]["created_at"] if messages else now
+        session = {
+            "id": session_id,
+            "tenant_id": tenant_id,
+            "started_at": started_at,
+            "ended_at": ended_at,
+            "turn_count": len(intents),
+            "final_intent": state.current_intent,
+            "context": state.context,
+        }
+        return {
+            SessionRecord: [session],
+            MessageRecord: messages,
+            IntentRecord: intents,
+            ToolCallRecord: tool_calls,
+        }
+
+    # Queries
+
+    def _hour(self, column):
+        if self.engine.dialect.name == "sqlite":
+            return func.strftime("%Y-%m-%d %H:00:00", column)
+        return func.date_trunc("hour", column)
+
+    def _filtered(self, query, column, start, end, tenant_id, session_column=None):
+        if start is not None:
+            query = query.where(column >= start)
+        if end is not None:
+            query = query.where(column < end)
+        if tenant_id is not None:
+            query = query.join(SessionRecord, SessionRecord.id == session_column).where(
+                SessionRecord.tenant_id == tenant_id
+            )
+        return query
+
+    async def _fetch(self, query) -> List[Any]:
+        def fetch():
+            with Session(self.engine) as db:
+                return db.execute(query).all()
+
+        return await self._run(fetch)
+
+    async def intent_distribution(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        tenant_id: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """Count turns per intent"""
+        query = select(IntentRecord.intent, func.count()).group_by(IntentRecord.intent)
+        query = self._filtered(
+            query, IntentRecord.created_at, start, end, tenant_id, IntentRecord.session_id
+        )
+        return {intent: count for intent, count in await self._fetch(query)}
+
+    async def turn_latency_by_hour(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        tenant_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Turn count and average/max latency per hour"""
+        hour = self._hour(IntentRecord.created_at).label("hour")
+        query = (
+            select(
+                hour,
+                func.count(),
+                func.avg(IntentRecord.latency_ms),
+                func.max(IntentRecord.latency_ms),
+            )
+            .group_by(hour)
+            .order_by(hour)
+        )
+        query = self._filtered(
+            query, IntentRecord.created_at, start, end, tenant_id, IntentRecord.session_id
+        )
+        return [
+            {"hour": str(row[0]), "turns": row[1], "avg_latency_ms": row[2], "max_latency_ms": row[3]}
+            for row in await self._fetch(query)
+        ]
+
+    async def tool_usage(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        tenant_id: Optional[str] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """Calls and failures per tool"""
+        failures = func.sum(case((ToolCallRecord.success.is_(False), 1), else_=0))
+        query = select(ToolCallRecord.tool_name, func.count(), failures).group_by(
+            ToolCallRecord.tool_name
+        )
+        query = self._filtered(
+            query, ToolCallRecord.created_at, start, end, tenant_id, ToolCallRecord.session_id
+        )
+        return {
+            name: {"calls": calls, "failures": int(failed or 0)}
+            for name, calls, failed in await self._fetch(query)
+        }
+
+    async def session_ids(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        tenant_id: Optional[str] = None,
+    ) -> List[str]:
+        """IDs of sessions that started in the given range"""
+        query = select(SessionRecord.id).order_by(SessionRecord.started_at)
+        if start is not None:
+            query = query.where(SessionRecord.started_at >= start)
+        if end is not None:
+            query = query.where(SessionRecord.started_at < end)
+        if tenant_id is not None:
+            query = query.where(SessionRecord.tenant_id == tenant_id)
+        return [row[0] for row in await self._fetch(query)]
+
+    async def session_messages(self, session_id: str) -> List[Dict[str, Any]]:
+        """Messages of an archived session in order"""
+        query = (
+            select(MessageRecord)
+            .where(MessageRecord.session_id == session_id)
+            .order_by(MessageRecord.seq)
+        )
+        return [
+            {
+                "type": record.type,
+                "content": record.content,
+                "created_at": record.created_at,
+                "metadata": record.metadata_,
+            }
+            for (record,) in await self._fetch(query)
+        ]
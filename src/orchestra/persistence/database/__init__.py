@@ -1 +1 @@
-# Database package placeholder
+"""SQL archive models for the persistence layer."""
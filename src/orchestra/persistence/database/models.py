@@ -1,3 +1,86 @@
 """Database models for persistence layer."""
 
-# Placeholder for ORM models
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class SessionRecord(Base):
+    """An archived conversation session."""
+
+    __tablename__ = "sessions"
+
+    id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    tenant_id: Mapped[Optional[str]] = mapped_column(String(64))
+    started_at: Mapped[datetime] = mapped_column(DateTime)
+    ended_at: Mapped[datetime] = mapped_column(DateTime)
+    turn_count: Mapped[int] = mapped_column(Integer, default=0)
+    final_intent: Mapped[Optional[str]] = mapped_column(String(64))
+    context: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
+
+    __table_args__ = (
+        Index("ix_sessions_started_at", "started_at"),
+        Index("ix_sessions_tenant_started_at", "tenant_id", "started_at"),
+    )
+
+
+class MessageRecord(Base):
+    """A single message within an archived session."""
+
+    __tablename__ = "messages"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    session_id: Mapped[str] = mapped_column(ForeignKey("sessions.id", ondelete="CASCADE"))
+    seq: Mapped[int] = mapped_column(Integer)
+    type: Mapped[str] = mapped_column(String(32))
+    content: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    metadata_: Mapped[Dict[str, Any]] = mapped_column("metadata", JSON, default=dict)
+
+    __table_args__ = (
+        Index("ix_messages_session_seq", "session_id", "seq"),
+        Index("ix_messages_created_at", "created_at"),
+    )
+
+
+class IntentRecord(Base):
+    """The classified intent and latency of one conversation turn."""
+
+    __tablename__ = "intents"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    session_id: Mapped[str] = mapped_column(ForeignKey("sessions.id", ondelete="CASCADE"))
+    message_seq: Mapped[int] = mapped_column(Integer)
+    intent: Mapped[str] = mapped_column(String(64))
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    latency_ms: Mapped[Optional[float]] = mapped_column(Float)
+
+    __table_args__ = (
+        Index("ix_intents_session", "session_id"),
+        Index("ix_intents_intent_created_at", "intent", "created_at"),
+        Index("ix_intents_created_at", "created_at"),
+    )
+
+
+class ToolCallRecord(Base):
+    """A tool invocation made while answering a turn."""
+
+    __tablename__ = "tool_calls"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    session_id: Mapped[str] = mapped_column(ForeignKey("sessions.id", ondelete="CASCADE"))
+    message_seq: Mapped[int] = mapped_column(Integer)
+    tool_name: Mapped[str] = mapped_column(String(64))
+    success: Mapped[Optional[bool]] = mapped_column(Boolean)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+
+    __table_args__ = (
+        Index("ix_tool_calls_session", "session_id"),
+        Index("ix_tool_calls_tool_created_at", "tool_name", "created_at"),
+    )
@@ -1,18 +1,40 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional
+
 import structlog
-from typing import Dict, Any
 
 
 class LoggingService:
     """Structured logging for conversation analytics"""
 
-    def __init__(self):
+    def __init__(self, interaction_log_path: Optional[str] = None):
         self.logger = structlog.get_logger()
+        # JSONL sink read by persistence.training_export
+        self.interaction_log_path = interaction_log_path or os.getenv("INTERACTION_LOG_PATH")
+        if self.interaction_log_path:
+            Path(self.interaction_log_path).parent.mkdir(parents=True, exist_ok=True)
 
     async def log_interaction(self, interaction: Dict[str, Any]) -> None:
         """Log a conversation interaction"""
         # TODO: Implement structured logging
-        # TODO: Export for training data
         self.logger.info("conversation_interaction", **interaction)
+        if self.interaction_log_path:
+            entry = {
+                "event": "conversation_interaction",
+                "timestamp": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+                **interaction,
+            }
+            line = json.dumps(entry, default=str) + "\n"
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, lambda: self._append(line))
+
+    def _append(self, line: str) -> None:
+        with open(self.interaction_log_path, "a", encoding="utf-8") as f:
+            f.write(line)
 
     async def log_error(self, error_data: Dict[str, Any]) -> None:
         """Log an error"""
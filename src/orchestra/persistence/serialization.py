@@ -0,0 +1,206 @@
+"""Pluggable serializers for conversation state.
+
+Every payload produced here starts with a four byte header::
+
+    b"OS" | format version | flags
+
+The low nibble of ``flags`` holds the codec id and bit 4 marks a
+zlib-compressed body.  Payloads without the header are treated as the
+legacy plain JSON written by earlier versions of ``SessionManager``.
+"""
+
+import json
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import msgpack
+
+from ..interfaces import ConversationState, Message, MessageType
+
+MAGIC = b"OS"
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+FLAG_COMPRESSED = 0x10
+CODEC_MASK = 0x0F
+
+DEFAULT_COMPRESS_THRESHOLD = 1024
+
+# Enum codes are part of the wire format: append new members, never reorder.
+_MESSAGE_TYPE_CODES: Dict[MessageType, int] = {
+    MessageType.USER_INPUT: 0,
+    MessageType.SYSTEM_RESPONSE: 1,
+    MessageType.TOOL_CALL: 2,
+    MessageType.TOOL_RESULT: 3,
+}
+_MESSAGE_TYPES_BY_CODE: Dict[int, MessageType] = {
+    code: member for member, code in _MESSAGE_TYPE_CODES.items()
+}
+
+
+class SerializationError(ValueError):
+    """Raised when a payload cannot be decoded."""
+
+
+class StateSerializer(ABC):
+    """Encode and decode ``ConversationState`` objects to bytes."""
+
+    codec_id: int
+
+    def __init__(self, compress_threshold: Optional[int] = DEFAULT_COMPRESS_THRESHOLD):
+        self.compress_threshold = compress_threshold
+
+    @abstractmethod
+    def _encode_body(self, state: ConversationState) -> bytes:
+        pass
+
+    @abstractmethod
+    def _decode_body(self, body: bytes) -> ConversationState:
+        pass
+
+    def dumps(self, state: ConversationState) -> bytes:
+        """Serialize a state, compressing bodies above the threshold."""
+        body = self._encode_body(state)
+        flags = self.codec_id
+        if self.compress_threshold is not None and len(body) > self.compress_threshold:
+            body = zlib.compress(body, 1)
+            flags |= FLAG_COMPRESSED
+        return MAGIC + bytes((FORMAT_VERSION, flags)) + body
+
+    def loads(self, data: bytes) -> ConversationState:
+        """Deserialize a payload written by this serializer."""
+        return loads_state(data)
+
+
+class JsonStateSerializer(StateSerializer):
+    """JSON body, equivalent to the original ``model_dump`` + ``json`` path."""
+
+    codec_id = CODEC_JSON
+
+    def _encode_body(self, state: ConversationState) -> bytes:
+        return json.dumps(state.model_dump(mode="json")).encode("utf-8")
+
+    def _decode_body(self, body: bytes) -> ConversationState:
+        return ConversationState(**json.loads(body))
+
+
+class MsgpackStateSerializer(StateSerializer):
+    """Compact msgpack body with positional fields and enum codes.
+
+    Field names are interned by position, ``MessageType`` is stored as a
+    small integer and a message's ``session_id`` is omitted when it
+    matches the owning state.  Decoders ignore trailing fields they do not
+    know about.  Missing trailing state fields fall back to model defaults
+    and a missing message ``session_id`` to the state's, so fields can be
+    appended without bumping ``FORMAT_VERSION``.  Anything shorter than the
+    required fields raises ``SerializationError``.
+    """
+
+    codec_id = CODEC_MSGPACK
+
+    def _encode_body(self, state: ConversationState) -> bytes:
+        session_id = state.session_id
+        return msgpack.packb(
+            [
+                session_id,
+                [encode_message(m, session_id) for m in state.messages],
+                state.context,
+                state.current_intent,
+                state.pending_tool_calls,
+            ],
+            use_bin_type=True,
+        )
+
+    def _decode_body(self, body: bytes) -> ConversationState:
+        fields = msgpack.unpackb(body, raw=False, strict_map_key=False)
+        if not isinstance(fields, (list, tuple)) or len(fields) < 2:
+            raise SerializationError("Truncated state body")
+        session_id = fields[0]
+        values: Dict[str, Any] = {
+            "session_id": session_id,
+            "messages": [_message_fields(m, session_id) for m in fields[1]],
+        }
+        if len(fields) > 2:
+            values["context"] = fields[2]
+        if len(fields) > 3:
+            values["current_intent"] = fields[3]
+        if len(fields) > 4:
+            values["pending_tool_calls"] = fields[4]
+        return ConversationState.model_validate(values)
+
+
+def encode_message(message: Message, session_id: Optional[str] = None) -> List[Any]:
+    """Encode a message as a positional list."""
+    return [
+        _MESSAGE_TYPE_CODES[message.type],
+        message.content,
+        message.metadata,
+        message.timestamp,
+        None if message.session_id == session_id else message.session_id,
+    ]
+
+
+def _message_fields(fields: List[Any], session_id: Optional[str]) -> Dict[str, Any]:
+    # type, content, metadata and timestamp are required; session_id may be
+    # omitted (or None) and then defaults to the owning state's.
+    if not isinstance(fields, (list, tuple)) or len(fields) < 4:
+        raise SerializationError(f"Truncated message {fields!r}")
+    try:
+        message_type = _MESSAGE_TYPES_BY_CODE[fields[0]]
+    except KeyError:
+        raise SerializationError(f"Unknown message type code {fields[0]!r}")
+    message_session = fields[4] if len(fields) > 4 else None
+    return {
+        "type": message_type,
+        "content": fields[1],
+        "metadata": fields[2],
+        "timestamp": fields[3],
+        "session_id": message_session if message_session is not None else session_id,
+    }
+
+
+def decode_message(fields: List[Any], session_id: Optional[str] = None) -> Message:
+    """Inverse of :func:`encode_message`."""
+    return Message.model_validate(_message_fields(fields, session_id))
+
+
+_SERIALIZERS: Dict[int, StateSerializer] = {
+    CODEC_JSON: JsonStateSerializer(),
+    CODEC_MSGPACK: MsgpackStateSerializer(),
+}
+
+
+def loads_state(data: Any) -> ConversationState:
+    """Decode any supported payload, including legacy headerless JSON."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if not data.startswith(MAGIC):
+        return ConversationState(**json.loads(data))
+    if len(data) < HEADER_SIZE:
+        raise SerializationError("Truncated state header")
+    version, flags = data[2], data[3]
+    if version > FORMAT_VERSION:
+        raise SerializationError(f"Unsupported state format version {version}")
+    serializer = _SERIALIZERS.get(flags & CODEC_MASK)
+    if serializer is None:
+        raise SerializationError(f"Unknown state codec {flags & CODEC_MASK}")
+    body = data[HEADER_SIZE:]
+    if flags & FLAG_COMPRESSED:
+        body = zlib.decompress(body)
+    return serializer._decode_body(body)
+
+
+def get_serializer(
+    name: str = "msgpack", compress_threshold: Optional[int] = DEFAULT_COMPRESS_THRESHOLD
+) -> StateSerializer:
+    """Return a serializer by name (``"msgpack"`` or ``"json"``)."""
+    name = name.lower()
+    if name == "msgpack":
+        return MsgpackStateSerializer(compress_threshold)
+    if name == "json":
+        return JsonStateSerializer(compress_threshold)
+    raise ValueError(f"Unknown serializer {name}")
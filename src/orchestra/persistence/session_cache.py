@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Set
+
+
+@dataclass
+class CacheEntry:
+    payload: bytes
+    version: int
+    expires_at: float
+
+
+class LRUCache:
+    """In-process LRU for serialized session payloads.
+
+    The cache is bounded by the total size of stored payloads rather than by
+    entry count, and entries expire ``ttl`` seconds after they were written.
+    Pinned entries are exempt from both eviction and expiry until unpinned.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._pinned: Set[str] = set()
+        self.size_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the live entry for ``key`` and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock() and key not in self._pinned:
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, payload: bytes, version: int) -> None:
+        """Store ``payload`` under ``key``, evicting old entries to fit."""
+        self._remove(key)
+        if len(payload) > self.max_bytes and key not in self._pinned:
+            return
+        self._entries[key] = CacheEntry(payload, version, self._clock() + self.ttl)
+        self.size_bytes += len(payload)
+        if self.size_bytes > self.max_bytes:
+            for candidate in list(self._entries):
+                if self.size_bytes <= self.max_bytes:
+                    break
+                if candidate in self._pinned:
+                    continue
+                self._remove(candidate)
+                self.evictions += 1
+
+    def pin(self, key: str) -> None:
+        """Exempt ``key`` from eviction and expiry."""
+        self._pinned.add(key)
+
+    def unpin(self, key: str) -> None:
+        self._pinned.discard(key)
+
+    def delete(self, key: str) -> bool:
+        """Remove ``key`` from the cache."""
+        self._pinned.discard(key)
+        return self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._pinned.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "pinned": len(self._pinned),
+            "size_bytes": self.size_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size_bytes -= len(entry.payload)
+        return True
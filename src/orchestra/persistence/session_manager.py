@@ -1,57 +1,253 @@
 import asyncio
-import json
 import os
-from typing import Optional
+import time
+from typing import Any, Dict, Optional, Set
 
 import redis
 
 from ..interfaces import PersistenceInterface, ConversationState
+from .serialization import StateSerializer, get_serializer, loads_state
+from .session_cache import LRUCache
+
+
+def merge_states(remote: ConversationState, local: ConversationState) -> ConversationState:
+    """Combine two diverged copies of a session without losing turns.
+
+    Messages are the union of both copies in timestamp order; context keys,
+    the intent and pending tool calls come from the local copy when set.
+    """
+    seen = {(m.type, m.timestamp, m.content) for m in remote.messages}
+    messages = list(remote.messages) + [
+        m for m in local.messages if (m.type, m.timestamp, m.content) not in seen
+    ]
+    messages.sort(key=lambda m: m.timestamp)
+    return remote.model_copy(
+        update={
+            "messages": messages,
+            "context": {**remote.context, **local.context},
+            "current_intent": local.current_intent or remote.current_intent,
+            "pending_tool_calls": local.pending_tool_calls or remote.pending_tool_calls,
+        }
+    )
 
 
 class SessionManager(PersistenceInterface):
-    """Redis-based session state management"""
+    """Redis-based session state management
+
+    Sessions are cached in an in-process LRU (L1) in front of Redis (L2).
+    Saves write through to both tiers and every Redis write bumps a per
+    session version counter; an L1 hit is only served after a cheap version
+    check confirms no other worker has written the session since.
 
-    def __init__(self):
+    When Redis is unreachable the manager runs in degraded mode: sessions
+    live only in L1 and are written back to Redis once it recovers.  If
+    another worker wrote the session meanwhile, the two copies are merged.
+    """
+
+    VERSION_SUFFIX = ":version"
+
+    def __init__(
+        self,
+        serializer: Optional[StateSerializer] = None,
+        cache: Optional[LRUCache] = None,
+    ):
         self.redis_client = None
+        self.serializer = serializer or get_serializer(
+            os.getenv("SESSION_SERIALIZER", "msgpack"),
+            int(os.getenv("SESSION_COMPRESS_THRESHOLD", "1024")),
+        )
+        self.cache = cache or LRUCache(
+            max_bytes=int(os.getenv("SESSION_L1_MAX_BYTES", str(64 * 1024 * 1024))),
+            ttl=float(os.getenv("SESSION_L1_TTL", "900")),
+        )
+        self.retry_interval = float(os.getenv("SESSION_REDIS_RETRY_INTERVAL", "5"))
+        self.degraded = False
+        self._next_retry = 0.0
+        self._dirty: Set[str] = set()
+        self._pending_deletes: Set[str] = set()
+        self.metrics: Dict[str, int] = {
+            "l1_hits": 0,
+            "l1_misses": 0,
+            "l1_stale": 0,
+            "l2_hits": 0,
+            "l2_misses": 0,
+            "redis_errors": 0,
+            "resyncs": 0,
+            "resynced_sessions": 0,
+            "resync_conflicts": 0,
+            "resync_lost_sessions": 0,
+        }
         self._connect()
 
-    def _connect(self):
+    def _connect(self) -> bool:
         """Connect to Redis"""
         redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
         try:
-            self.redis_client = redis.Redis.from_url(redis_url, decode_responses=True)
+            self.redis_client = redis.Redis.from_url(redis_url)
             self.redis_client.ping()
         except Exception:
             self.redis_client = None
+            self._mark_degraded()
+            return False
+        return True
+
+    def _mark_degraded(self) -> None:
+        self.degraded = True
+        self._next_retry = time.monotonic() + self.retry_interval
+
+    async def _run(self, func) -> Any:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, func)
+
+    async def _available(self) -> bool:
+        """Return whether Redis can be used, reconnecting and resyncing if due."""
+        if not self.degraded:
+            return True
+        if time.monotonic() < self._next_retry:
+            return False
+        if self.redis_client is None:
+            connected = await self._run(self._connect)
+        else:
+            try:
+                connected = await self._run(self.redis_client.ping)
+            except redis.RedisError:
+                connected = False
+        if not connected:
+            self._mark_degraded()
+            return False
+        self.degraded = False
+        await self._resync()
+        return not self.degraded
+
+    async def _resync(self) -> None:
+        """Push sessions written or deleted while degraded back to Redis."""
+        self.metrics["resyncs"] += 1
+        try:
+            for session_id in list(self._pending_deletes):
+                await self._run(
+                    lambda: self.redis_client.delete(
+                        session_id, session_id + self.VERSION_SUFFIX
+                    )
+                )
+                self._pending_deletes.discard(session_id)
+            for session_id in list(self._dirty):
+                entry = self.cache.get(session_id)
+                if entry is None:
+                    self.metrics["resync_lost_sessions"] += 1
+                else:
+                    payload = entry.payload
+                    remote, remote_version = await self._read(session_id)
+                    if remote and int(remote_version or 0) > entry.version:
+                        # Redis moved on since the local copy was read (or the
+                        # local copy was never read from Redis at all, e.g. a
+                        # session re-created while degraded).  Neither side
+                        # may overwrite the other, so merge the turns.
+                        self.metrics["resync_conflicts"] += 1
+                        payload = self.serializer.dumps(
+                            merge_states(loads_state(remote), loads_state(payload))
+                        )
+                    version = await self._write(session_id, payload)
+                    self.cache.set(session_id, payload, version)
+                    self.metrics["resynced_sessions"] += 1
+                self._dirty.discard(session_id)
+                self.cache.unpin(session_id)
+        except redis.RedisError:
+            self.metrics["redis_errors"] += 1
+            self._mark_degraded()
+
+    async def _read(self, session_id: str):
+        def read():
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.get(session_id)
+            pipe.get(session_id + self.VERSION_SUFFIX)
+            return pipe.execute()
+
+        return await self._run(read)
+
+    async def _write(self, session_id: str, payload: bytes) -> int:
+        def write() -> int:
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.incr(session_id + self.VERSION_SUFFIX)
+            pipe.set(session_id, payload)
+            version, _ = pipe.execute()
+            return int(version)
+
+        return await self._run(write)
 
     async def get_session(self, session_id: str) -> Optional[ConversationState]:
         """Get conversation state by session ID"""
-        if not self.redis_client:
-            return None
-        loop = asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, lambda: self.redis_client.get(session_id))
+        available = await self._available()
+        entry = self.cache.get(session_id)
+        if not available:
+            if entry is None:
+                self.metrics["l1_misses"] += 1
+                return None
+            self.metrics["l1_hits"] += 1
+            return loads_state(entry.payload)
+
+        try:
+            if entry is not None:
+                version = await self._run(
+                    lambda: self.redis_client.get(session_id + self.VERSION_SUFFIX)
+                )
+                if version is not None and int(version) == entry.version:
+                    self.metrics["l1_hits"] += 1
+                    return loads_state(entry.payload)
+                self.metrics["l1_stale"] += 1
+                self.cache.delete(session_id)
+            else:
+                self.metrics["l1_misses"] += 1
+
+            data, version = await self._read(session_id)
+        except redis.RedisError:
+            self.metrics["redis_errors"] += 1
+            self._mark_degraded()
+            return loads_state(entry.payload) if entry is not None else None
+
         if not data:
+            self.metrics["l2_misses"] += 1
             return None
-        payload = json.loads(data)
-        return ConversationState(**payload)
+        self.metrics["l2_hits"] += 1
+        self.cache.set(session_id, data, int(version or 0))
+        return loads_state(data)
 
     async def save_state(self, state: ConversationState) -> None:
-        """Save conversation state to Redis"""
-        if not self.redis_client:
-            return
-        loop = asyncio.get_event_loop()
-        data = json.dumps(state.model_dump())
-        await loop.run_in_executor(None, lambda: self.redis_client.set(state.session_id, data))
+        """Save conversation state to the local cache and Redis"""
+        session_id = state.session_id
+        data = self.serializer.dumps(state)
+        self._pending_deletes.discard(session_id)
+        if await self._available():
+            try:
+                version = await self._write(session_id, data)
+                self.cache.set(session_id, data, version)
+                return
+            except redis.RedisError:
+                self.metrics["redis_errors"] += 1
+                self._mark_degraded()
+        # Until it reaches Redis the L1 copy is the only one, so it is pinned
+        # against LRU eviction and TTL expiry.
+        entry = self.cache.get(session_id)
+        self.cache.pin(session_id)
+        self.cache.set(session_id, data, entry.version if entry is not None else 0)
+        self._dirty.add(session_id)
 
     async def delete_session(self, session_id: str) -> bool:
         """Delete a conversation session"""
-        if not self.redis_client:
-            return False
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, lambda: self.redis_client.delete(session_id)
-        )
-        return result > 0
+        existed = self.cache.delete(session_id)
+        self._dirty.discard(session_id)
+        if await self._available():
+            try:
+                result = await self._run(
+                    lambda: self.redis_client.delete(
+                        session_id, session_id + self.VERSION_SUFFIX
+                    )
+                )
+                return result > 0 or existed
+            except redis.RedisError:
+                self.metrics["redis_errors"] += 1
+                self._mark_degraded()
+        self._pending_deletes.add(session_id)
+        return existed
 
     async def get_or_create_session(self, session_id: str) -> ConversationState:
         """Get existing session or create new one"""
@@ -59,3 +255,14 @@ class SessionManager(PersistenceInterface):
         if not state:
             state = ConversationState(session_id=session_id)
         return state
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache and Redis health metrics"""
+        lookups = self.metrics["l1_hits"] + self.metrics["l1_misses"] + self.metrics["l1_stale"]
+        return {
+            **self.metrics,
+            "l1_hit_rate": self.metrics["l1_hits"] / lookups if lookups else 0.0,
+            "degraded": self.degraded,
+            "dirty_sessions": len(self._dirty),
+            "l1": self.cache.stats(),
+        }
@@ -0,0 +1,343 @@
+"""Streaming export of conversation transcripts for training data.
+
+Records flow through a chain of generators::
+
+    source -> filter_records -> redact_records -> dedupe_turns -> write_shards
+
+so memory stays flat no matter how many interactions are exported.  Sources
+are the JSONL interaction log written by ``LoggingService`` and the SQL
+``ConversationArchive``.  Each ``ExportTask`` covers one partition (a log
+file or a day of archive data).  ``export`` runs tasks across a process
+pool, and each task writes its own gzip-compressed JSONL shards.  A
+``manifest.json`` lists every shard with its record count and checksum.
+"""
+
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from ..interfaces import MessageType
+from .database.models import MessageRecord, SessionRecord
+
+Record = Dict[str, Any]
+
+PHONE_PATTERN = re.compile(r"(?<!\w)(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{3}\)|\d{3})[\s.-]?\d{3}[\s.-]?\d{4}(?!\w)")
+PHONE_PLACEHOLDER = "[PHONE]"
+_NORMALIZE_PATTERN = re.compile(r"[^a-z0-9]+")
+# Each remembered turn costs roughly 150 bytes, so ~15 MB per worker.
+DEDUPE_WINDOW = 100_000
+
+
+@dataclass
+class ExportFilters:
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    intents: Optional[Set[str]] = None
+    tenants: Optional[Set[str]] = None
+
+
+@dataclass
+class ExportTask:
+    """One partition of an export, small enough to pickle to a worker."""
+
+    source: str  # "log" or "archive"
+    location: str  # log file path or database URL
+    prefix: str
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    filters: ExportFilters = field(default_factory=ExportFilters)
+
+
+@dataclass
+class ShardInfo:
+    path: str
+    records: int
+    bytes: int
+    sha256: str
+
+
+# Sources
+
+
+def iter_log_records(path: str) -> Iterator[Record]:
+    """Yield one single-turn record per interaction in a JSONL log file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("event", "conversation_interaction") != "conversation_interaction":
+                continue
+            yield {
+                "session_id": entry.get("session_id"),
+                "tenant_id": entry.get("tenant_id"),
+                "started_at": entry.get("timestamp"),
+                "turns": [
+                    {
+                        "user": entry.get("user_input", ""),
+                        "assistant": entry.get("ai_response", ""),
+                        "intent": entry.get("intent"),
+                    }
+                ],
+            }
+
+
+def iter_archive_records(
+    database_url: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = 1000,
+) -> Iterator[Record]:
+    """Yield one record per archived session, streaming rows in batches."""
+    query = (
+        select(
+            SessionRecord.id,
+            SessionRecord.tenant_id,
+            SessionRecord.started_at,
+            MessageRecord.type,
+            MessageRecord.content,
+            MessageRecord.metadata_,
+        )
+        .join(MessageRecord, MessageRecord.session_id == SessionRecord.id)
+        .order_by(SessionRecord.id, MessageRecord.seq)
+        .execution_options(yield_per=batch_size)
+    )
+    if start is not None:
+        query = query.where(SessionRecord.started_at >= start)
+    if end is not None:
+        query = query.where(SessionRecord.started_at < end)
+
+    engine = create_engine(database_url)
+    try:
+        with Session(engine) as db:
+            rows = db.execute(query)
+            for session_id, group in itertools.groupby(rows, key=lambda row: row[0]):
+                turns: List[Dict[str, Any]] = []
+                tenant_id = started_at = None
+                user_text: Optional[str] = None
+                for _, tenant_id, started_at, message_type, content, metadata in group:
+                    if message_type == MessageType.USER_INPUT.value:
+                        user_text = content
+                    elif message_type == MessageType.SYSTEM_RESPONSE.value and user_text is not None:
+                        turns.append(
+                            {
+                                "user": user_text,
+                                "assistant": content,
+                                "intent": (metadata or {}).get("intent"),
+                            }
+                        )
+                        user_text = None
+                yield {
+                    "session_id": session_id,
+                    "tenant_id": tenant_id,
+                    "started_at": started_at.isoformat() if started_at else None,
+                    "turns": turns,
+                }
+    finally:
+        engine.dispose()
+
+
+# Pipeline stages
+
+
+def filter_records(records: Iterable[Record], filters: ExportFilters) -> Iterator[Record]:
+    """Drop records outside the date range or tenant set, and turns outside the intent set."""
+    start = filters.start.isoformat() if filters.start else None
+    end = filters.end.isoformat() if filters.end else None
+    for record in records:
+        started_at = record.get("started_at")
+        if start and (not started_at or started_at < start):
+            continue
+        if end and (not started_at or started_at >= end):
+            continue
+        if filters.tenants is not None and record.get("tenant_id") not in filters.tenants:
+            continue
+        if filters.intents is not None:
+            turns = [t for t in record["turns"] if t.get("intent") in filters.intents]
+            if not turns:
+                continue
+            record = {**record, "turns": turns}
+        yield record
+
+
+def redact_text(text: str) -> str:
+    return PHONE_PATTERN.sub(PHONE_PLACEHOLDER, text or "")
+
+
+def redact_records(records: Iterable[Record]) -> Iterator[Record]:
+    """Replace phone numbers in every turn."""
+    for record in records:
+        record["turns"] = [
+            {**turn, "user": redact_text(turn["user"]), "assistant": redact_text(turn["assistant"])}
+            for turn in record["turns"]
+        ]
+        yield record
+
+
+def _turn_key(turn: Dict[str, Any]) -> bytes:
+    normalized = "\x1f".join(
+        " ".join(_NORMALIZE_PATTERN.sub(" ", turn[part].lower()).split())
+        for part in ("user", "assistant")
+    )
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest()
+
+
+def dedupe_turns(records: Iterable[Record], window: int = DEDUPE_WINDOW) -> Iterator[Record]:
+    """Drop turns identical after normalizing case, punctuation and spacing.
+
+    Seen turns are remembered as 8-byte hashes in a bounded LRU window, so
+    memory use is capped regardless of input size.
+    """
+    seen: "OrderedDict[bytes, None]" = OrderedDict()
+    for record in records:
+        turns = []
+        for turn in record["turns"]:
+            key = _turn_key(turn)
+            if key in seen:
+                seen.move_to_end(key)
+                continue
+            seen[key] = None
+            if len(seen) > window:
+                seen.popitem(last=False)
+            turns.append(turn)
+        if turns:
+            record["turns"] = turns
+            yield record
+
+
+# Output
+
+
+def write_shards(
+    records: Iterable[Record], out_dir: str, prefix: str = "part", shard_size: int = 50_000
+) -> List[ShardInfo]:
+    """Write records to ``<prefix>-NNNNN.jsonl.gz`` shards of ``shard_size`` records."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    shards: List[ShardInfo] = []
+    records = iter(records)
+    for index in itertools.count():
+        chunk = itertools.islice(records, shard_size)
+        first = next(chunk, None)
+        if first is None:
+            break
+        path = out / f"{prefix}-{index:05d}.jsonl.gz"
+        count = 0
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for record in itertools.chain([first], chunk):
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+        shards.append(ShardInfo(path.name, count, path.stat().st_size, _sha256(path)))
+    return shards
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Orchestration
+
+
+def run_task(
+    task: ExportTask, out_dir: str, shard_size: int = 50_000, dedupe_window: int = DEDUPE_WINDOW
+) -> List[ShardInfo]:
+    """Run the full pipeline for one partition."""
+    if task.source == "log":
+        records = iter_log_records(task.location)
+    elif task.source == "archive":
+        records = iter_archive_records(task.location, task.start, task.end)
+    else:
+        raise ValueError(f"Unknown export source {task.source}")
+    records = filter_records(records, task.filters)
+    records = redact_records(records)
+    records = dedupe_turns(records, dedupe_window)
+    return write_shards(records, out_dir, task.prefix, shard_size)
+
+
+def archive_tasks(
+    database_url: str, start: datetime, end: datetime, filters: Optional[ExportFilters] = None
+) -> List[ExportTask]:
+    """Split an archive export into one task per day."""
+    tasks = []
+    day = start
+    while day < end:
+        next_day = min(day + timedelta(days=1), end)
+        tasks.append(
+            ExportTask(
+                "archive",
+                database_url,
+                prefix=f"archive-{day:%Y%m%d}",
+                start=day,
+                end=next_day,
+                filters=filters or ExportFilters(),
+            )
+        )
+        day = next_day
+    return tasks
+
+
+def log_tasks(paths: Iterable[str], filters: Optional[ExportFilters] = None) -> List[ExportTask]:
+    """One task per interaction log file."""
+    return [
+        ExportTask("log", str(path), prefix=f"log-{index:04d}", filters=filters or ExportFilters())
+        for index, path in enumerate(paths)
+    ]
+
+
+def export(
+    tasks: List[ExportTask],
+    out_dir: str,
+    processes: int = 1,
+    shard_size: int = 50_000,
+    dedupe_window: int = DEDUPE_WINDOW,
+) -> Dict[str, Any]:
+    """Run tasks, in a process pool when ``processes > 1``, and write the manifest.
+
+    Near-duplicate detection is per task, so duplicates that span
+    partitions are only removed within each partition.
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(
+                pool.map(
+                    run_task,
+                    tasks,
+                    itertools.repeat(out_dir),
+                    itertools.repeat(shard_size),
+                    itertools.repeat(dedupe_window),
+                )
+            )
+    else:
+        results = [run_task(task, out_dir, shard_size, dedupe_window) for task in tasks]
+
+    shards = [asdict(shard) for result in results for shard in result]
+    manifest = {
+        "created_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+        "records": sum(shard["records"] for shard in shards),
+        "shards": shards,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
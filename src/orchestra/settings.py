@@ -15,6 +15,14 @@ class OrchestrationSettings(BaseSettings):
     openai_api_key: str = Field(..., env="OPENAI_API_KEY")
     model_name: str = Field("gpt-4", env="LLM_MODEL_NAME")
     temperature: float = Field(0.1, env="LLM_TEMPERATURE")
+    hedge_model_name: Optional[str] = Field(None, env="LLM_HEDGE_MODEL_NAME")
+    hedging_enabled: bool = Field(True, env="LLM_HEDGING_ENABLED")
+    hedge_percentile: float = Field(0.9, env="LLM_HEDGE_PERCENTILE")
+    max_hedge_ratio: float = Field(0.1, env="LLM_MAX_HEDGE_RATIO")
+    circuit_failure_threshold: int = Field(5, env="LLM_CIRCUIT_FAILURE_THRESHOLD")
+    circuit_reset_timeout: float = Field(30.0, env="LLM_CIRCUIT_RESET_TIMEOUT")
+    slow_call_threshold: float = Field(10.0, env="LLM_SLOW_CALL_THRESHOLD")
+    order_confidence_threshold: float = Field(0.8, env="ORDER_CONFIDENCE_THRESHOLD")
 
     class Config:
         env_prefix = "ORCHESTRA_"
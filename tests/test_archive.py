@@ -0,0 +1,163 @@
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure the src package is on the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+
+from orchestra.interfaces import ConversationState, Message, MessageType
+from orchestra.persistence.archive import ConversationArchive
+
+HOUR = 3600.0
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _turn(session_id, ts, intent, latency_ms, tools=()):
+    return [
+        Message(type=MessageType.USER_INPUT, content='hi', timestamp=ts, session_id=session_id),
+        Message(
+            type=MessageType.SYSTEM_RESPONSE,
+            content='hello',
+            timestamp=ts + 1,
+            session_id=session_id,
+            metadata={
+                'intent': intent,
+                'latency_ms': latency_ms,
+                'tool_calls': [{'tool_name': t, 'success': ok} for t, ok in tools],
+            },
+        ),
+    ]
+
+
+def _state(session_id, *turns):
+    messages = [m for turn in turns for m in turn]
+    return ConversationState(session_id=session_id, messages=messages)
+
+
+def test_archive_and_query(tmp_path):
+    archive = ConversationArchive(f"sqlite:///{tmp_path / 'archive.db'}", batch_size=2)
+
+    async def scenario():
+        await archive.start()
+        archive.archive(
+            _state(
+                's1',
+                _turn('s1', BASE, 'menu_query', 100, [('get_menu', True)]),
+                _turn('s1', BASE + 60, 'general', 300),
+            ),
+            tenant_id='t1',
+        )
+        archive.archive(
+            _state('s2', _turn('s2', BASE + HOUR, 'menu_query', 200, [('get_menu', False)])),
+            tenant_id='t2',
+        )
+        await archive.stop()
+        return (
+            await archive.intent_distribution(),
+            await archive.intent_distribution(tenant_id='t2'),
+            await archive.turn_latency_by_hour(),
+            await archive.tool_usage(),
+            await archive.session_messages('s1'),
+        )
+
+    intents, tenant_intents, latency, tools, messages = asyncio.run(scenario())
+    assert intents == {'menu_query': 2, 'general': 1}
+    assert tenant_intents == {'menu_query': 1}
+    assert [row['turns'] for row in latency] == [2, 1]
+    assert latency[0]['avg_latency_ms'] == 200
+    assert tools == {'get_menu': {'calls': 2, 'failures': 1}}
+    assert len(messages) == 4
+    assert archive.metrics['archived_sessions'] == 2
+
+
+def test_rearchiving_replaces_rows(tmp_path):
+    archive = ConversationArchive(f"sqlite:///{tmp_path / 'archive.db'}")
+
+    async def scenario():
+        await archive.start()
+        archive.archive(_state('s1', _turn('s1', BASE, 'general', 10)))
+        archive.archive(
+            _state('s1', _turn('s1', BASE, 'general', 10), _turn('s1', BASE + 5, 'menu_query', 10))
+        )
+        await archive.stop()
+        return await archive.intent_distribution(start=datetime(2024, 1, 1), end=datetime(2024, 1, 2))
+
+    assert asyncio.run(scenario()) == {'general': 1, 'menu_query': 1}
+
+
+def test_stop_writes_batch_in_progress(tmp_path):
+    archive = ConversationArchive(f"sqlite:///{tmp_path / 'archive.db'}", flush_interval=5)
+
+    async def scenario():
+        await archive.start()
+        archive.archive(_state('s1', _turn('s1', BASE, 'general', 10)))
+        await asyncio.sleep(0.1)
+        await archive.stop()
+        return await archive.session_ids()
+
+    assert asyncio.run(scenario()) == ['s1']
+
+
+def test_failed_write_is_retried_before_callback(tmp_path, monkeypatch):
+    archive = ConversationArchive(f"sqlite:///{tmp_path / 'archive.db'}", retry_delay=0.01)
+    write_batch = archive._write_batch
+    failures = [RuntimeError('database is locked')]
+    archived = []
+
+    def flaky(batch):
+        if failures:
+            raise failures.pop()
+        write_batch(batch)
+
+    monkeypatch.setattr(archive, '_write_batch', flaky)
+
+    async def deleted():
+        archived.append('s1')
+
+    async def scenario():
+        await archive.start()
+        archive.archive(_state('s1', _turn('s1', BASE, 'general', 10)), on_archived=deleted)
+        await archive.stop()
+        return await archive.session_ids()
+
+    assert asyncio.run(scenario()) == ['s1']
+    assert archived == ['s1']
+    assert archive.metrics['write_retries'] == 1
+    assert archive.metrics['failed_sessions'] == 0
+
+
+def test_exhausted_batches_are_requeued(tmp_path, monkeypatch):
+    archive = ConversationArchive(
+        f"sqlite:///{tmp_path / 'archive.db'}",
+        flush_interval=0.01,
+        max_retries=1,
+        retry_delay=0,
+        requeue_delay=0.2,
+    )
+    write_batch = archive._write_batch
+    failures = [RuntimeError('database is down')] * 2
+    archived = []
+
+    def flaky(batch):
+        if failures:
+            raise failures.pop()
+        write_batch(batch)
+
+    monkeypatch.setattr(archive, '_write_batch', flaky)
+
+    async def scenario():
+        await archive.start()
+        archive.archive(_state('s1', _turn('s1', BASE, 'general', 10)), on_archived=lambda: archived.append('s1'))
+        await asyncio.sleep(0.1)
+        assert list(archive.failed) == ['s1'] and not archived
+        await asyncio.sleep(0.4)
+        ids = await archive.session_ids()
+        await archive.stop()
+        return ids
+
+    assert asyncio.run(scenario()) == ['s1']
+    assert archived == ['s1']
+    assert not archive.failed
+    assert archive.metrics['failed_sessions'] == 1
+    assert archive.metrics['requeued_sessions'] == 1
@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+
+# Ensure the src package is on the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+
+from orchestra.orchestration.agents.entity_extractor import MenuEntityExtractor, TokenAutomaton
+from orchestra.orchestration.agents.parser_agent import ParserAgent
+
+MENU = {
+    'Mains': [
+        {'name': 'Gyro Platter', 'price': 15.99},
+        {'name': 'Falafel Wrap', 'price': 12.99},
+        {'name': 'Chicken Wrap', 'price': 11.99, 'aliases': ['chicken pita']},
+    ],
+    'Desserts': [{'name': 'Baklava', 'price': 6.99}],
+}
+
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = TokenAutomaton()
+    automaton.add(('falafel',), 'f')
+    automaton.add(('falafel', 'wrap'), 'fw')
+    automaton.add(('wrap',), 'w')
+    automaton.compile()
+    assert sorted(automaton.find(['a', 'falafel', 'wrap'])) == [(1, 2, 'f'), (1, 3, 'fw'), (2, 3, 'w')]
+
+
+def test_extracts_items_quantities_and_modifiers():
+    result = MenuEntityExtractor(MENU).extract(
+        "I'd like two falafel wraps and a gyro platter with chicken and no onions, plus 3 baklava"
+    )
+    assert [(i.item, i.quantity) for i in result.items] == [
+        ('Falafel Wrap', 2),
+        ('Gyro Platter', 1),
+        ('Baklava', 3),
+    ]
+    assert result.items[1].modifiers == ['with chicken', 'no onions']
+    assert result.order_cue
+    assert result.confidence >= 0.8
+
+
+def test_aliases_and_trailing_quantity():
+    result = MenuEntityExtractor(MENU).extract('gyros x2 and a chicken pita')
+    assert [(i.item, i.quantity) for i in result.items] == [('Gyro Platter', 2), ('Chicken Wrap', 1)]
+
+
+def test_compound_quantities():
+    extractor = MenuEntityExtractor(MENU)
+    for text, quantity in (
+        ('twenty one baklava', 21),
+        ('two hundred baklava', 200),
+        ('I want one hundred and five baklava', 105),
+        ('I want a baklava x2', 2),
+        ('two dozen baklava', 24),
+        ('half dozen baklava', 6),
+        ('baklava times twenty one', 21),
+    ):
+        result = extractor.extract(text)
+        assert result.items[0].quantity == quantity, text
+        assert result.confidence == 1.0, text
+    assert extractor.extract('two three baklava').confidence < 0.5
+    assert extractor.extract('two baklava x3').confidence < 0.5
+
+
+def test_ambiguous_alias_has_low_confidence():
+    menu = {'Mains': [{'name': 'Lamb Wrap'}, {'name': 'Lamb Platter'}]}
+    result = MenuEntityExtractor(menu).extract('one lamb please')
+    assert result.items[0].candidates == ['Lamb Platter', 'Lamb Wrap']
+    assert result.confidence < 0.5
+
+
+def test_questions_are_not_orders():
+    result = MenuEntityExtractor(MENU).extract('how much is the falafel wrap')
+    assert result.items and not result.order_cue
+
+
+def test_availability_questions_and_removals_are_not_orders():
+    extractor = MenuEntityExtractor(MENU)
+    for text in (
+        'Do you have baklava?',
+        "I don't want the baklava anymore",
+        'remove the baklava from my order',
+        'no more baklava',
+    ):
+        result = extractor.extract(text)
+        assert result.items and not result.order_cue, text
+    result = extractor.extract('is there a gyro platter on the menu')
+    assert not result.order_cue
+    assert result.confidence < 1.0
+
+
+def test_swaps_choices_and_corrections_have_low_confidence():
+    extractor = MenuEntityExtractor(MENU)
+    for text in (
+        'can I get a baklava instead of the falafel wrap',
+        'I want the falafel wrap or the baklava',
+        'actually make that three baklava',
+        'make it two gyros',
+        'swap the gyro platter for a falafel wrap',
+    ):
+        assert extractor.extract(text).confidence < 0.8, text
+
+
+def test_polite_requests_are_orders():
+    extractor = MenuEntityExtractor(MENU)
+    assert extractor.extract('can I get two gyros').order_cue
+    assert extractor.extract('could you add a baklava').order_cue
+
+
+def test_parser_rebuilds_only_when_menu_changes():
+    menus = {'t1': MENU}
+    agent = ParserAgent(menu_provider=lambda tenant_id: menus[tenant_id])
+    assert agent.parse('two baklava', 't1').items[0].quantity == 2
+    first = agent._extractor('t1')
+    menus['t1'] = dict(MENU)
+    assert agent._extractor('t1') is first
+    menus['t1'] = {'Desserts': [{'name': 'Rice Pudding'}]}
+    assert agent.parse('one rice pudding', 't1').items[0].item == 'Rice Pudding'
@@ -0,0 +1,128 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure the src package is on the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+
+from orchestra.orchestration.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgedLLM,
+    LatencyTracker,
+)
+
+
+class FakeCompletions:
+    def __init__(self, delays, fail=False):
+        self.delays = delays
+        self.fail = fail
+        self.models = []
+
+    def create(self, model, **kwargs):
+        self.models.append(model)
+        time.sleep(self.delays.get(model, 0))
+        if self.fail:
+            raise RuntimeError('boom')
+        return model
+
+
+def _client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+def test_latency_percentile():
+    tracker = LatencyTracker()
+    for i in range(1, 101):
+        tracker.record(i)
+    assert tracker.percentile(0.95) == 95
+    assert LatencyTracker().percentile(0.5) is None
+
+
+def test_breaker_opens_and_half_opens():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] = 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_threshold=1.0)
+    breaker.record_success(2.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_hedge_to_faster_model_wins():
+    completions = FakeCompletions({'slow': 0.5, 'fast': 0.0})
+    llm = HedgedLLM(_client(completions), model='slow', hedge_model='fast', initial_hedge_delay=0.05)
+    assert asyncio.run(llm.create(messages=[])) == 'fast'
+    assert completions.models == ['slow', 'fast']
+    assert llm.metrics['hedge_wins'] == 1
+
+
+def test_open_circuit_short_circuits():
+    completions = FakeCompletions({}, fail=True)
+    llm = HedgedLLM(_client(completions), model='m', breaker=CircuitBreaker(failure_threshold=1))
+    with pytest.raises(RuntimeError):
+        asyncio.run(llm.create(messages=[]))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(llm.create(messages=[]))
+    assert len(completions.models) == 1
+
+
+def test_primary_latency_recorded_after_hedge_wins():
+    completions = FakeCompletions({'slow': 0.3, 'fast': 0.0})
+    llm = HedgedLLM(_client(completions), model='slow', hedge_model='fast', initial_hedge_delay=0.05)
+
+    async def scenario():
+        result = await llm.create(messages=[])
+        assert len(llm.latencies) == 0
+        await asyncio.sleep(0.4)
+        return result
+
+    assert asyncio.run(scenario()) == 'fast'
+    assert len(llm.latencies) == 1
+    assert llm.latencies.percentile(0.5) >= 0.3
+
+
+def test_hedges_capped_by_ratio():
+    completions = FakeCompletions({'slow': 0.1, 'fast': 0.0})
+    llm = HedgedLLM(
+        _client(completions), model='slow', hedge_model='fast',
+        initial_hedge_delay=0.01, max_hedge_ratio=0.25,
+    )
+
+    async def scenario():
+        for _ in range(8):
+            await llm.create(messages=[])
+
+    asyncio.run(scenario())
+    assert llm.metrics['hedges'] == 2
+
+
+def test_cancelled_trial_call_releases_half_open_slot():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 10
+    completions = FakeCompletions({'m': 0.2})
+    llm = HedgedLLM(_client(completions), model='m', breaker=breaker, hedging=False)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(llm.create(messages=[]), timeout=0.05)
+        return await llm.create(messages=[])
+
+    assert asyncio.run(scenario()) == 'm'
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+# Ensure the src package is on the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+
+from orchestra.knowledge.menu_service import load_menu
+from orchestra.orchestration.responder import ResponseTemplate, TemplateResponder, join_list
+
+
+def _menu_results():
+    return [{'get_menu': {'success': True, 'result': load_menu()}}]
+
+
+def test_join_list():
+    assert join_list([]) == ''
+    assert join_list(['a']) == 'a'
+    assert join_list(['a', 'b', 'c']) == 'a, b and c'
+
+
+def test_template_missing_field_returns_none():
+    template = ResponseTemplate('{name} costs ${price:.2f}')
+    assert template.fields == {'name', 'price'}
+    assert template.render({'name': 'Baklava'}) is None
+    assert template.render({'name': 'Baklava', 'price': 6.99}) == 'Baklava costs $6.99'
+
+
+def test_menu_item_category_and_overview():
+    responder = TemplateResponder()
+    item = responder.respond('menu_query', 'how much is the baklava?', _menu_results())
+    assert item.startswith('The Baklava is $6.99.')
+    category = responder.respond('menu_query', 'what desserts do you have', _menu_results())
+    assert category == 'Our desserts are Baklava.'
+    overview = responder.respond('menu_query', 'what do you serve', _menu_results())
+    assert overview.startswith('We have appetizers, main courses and desserts.')
+
+
+def test_tenant_override():
+    responder = TemplateResponder(tenant_templates={'t1': {'business_hours': 'Open {hours}!'}})
+    results = [{'get_business_hours': {'success': True, 'result': {'hours': '9-5'}}}]
+    assert responder.respond('business_hours', 'hours?', results, tenant_id='t1') == 'Open 9-5!'
+    assert responder.respond('business_hours', 'hours?', results) == 'Our hours are 9-5.'
+
+
+def test_order_confirmation_uses_call_parameters():
+    responder = TemplateResponder()
+    calls = [
+        {'tool_name': 'add_order_to_sheet', 'parameters': {'item': 'Falafel Wrap', 'quantity': 2}},
+        {'tool_name': 'add_order_to_sheet', 'parameters': {'item': 'Baklava', 'quantity': 1}},
+    ]
+    results = [{'add_order_to_sheet': {'success': True, 'result': 'ok'}}]
+    assert responder.respond('place_order', '', results, tool_calls=calls) == (
+        'Got it: 2 x Falafel Wrap and 1 x Baklava. Anything else?'
+    )
+
+
+def test_falls_back_when_uncovered():
+    responder = TemplateResponder()
+    assert responder.respond('general', 'hello', []) is None
+    failed = [{'get_menu': {'success': False, 'error': 'boom'}}]
+    assert responder.respond('menu_query', 'menu', failed) is None
+
+
+def test_menu_questions_beyond_listing_go_to_llm():
+    responder = TemplateResponder()
+    for question in (
+        'Which appetizers are vegetarian?',
+        'is the baklava gluten free',
+        'how much sugar is in the baklava',
+        'do you have anything spicy',
+    ):
+        assert responder.respond('menu_query', question, _menu_results()) is None, question
+    assert responder.respond('menu_query', "What's on the menu?", _menu_results()).startswith('We have')
+    assert responder.respond('menu_query', 'Tell me about the gyro platter', _menu_results()).startswith(
+        'The Gyro Platter is'
+    )
+
+
+def test_missing_hours_go_to_llm():
+    responder = TemplateResponder()
+    for result in ({'hours': None}, {'hours': ''}, {}):
+        results = [{'get_business_hours': {'success': True, 'result': result}}]
+        assert responder.respond('business_hours', 'hours?', results) is None
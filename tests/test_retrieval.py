@@ -0,0 +1,82 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# Ensure the src package is on the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+
+from orchestra.knowledge import retrieval
+from orchestra.knowledge.retrieval import (
+    HashingEmbedder,
+    MenuSource,
+    TextFileSource,
+    VectorIndex,
+)
+
+
+def test_hashing_embedder_is_deterministic():
+    embedder = HashingEmbedder(dim=64)
+    a = embedder.embed(['falafel wrap', 'baklava'])
+    assert a.shape == (2, 64)
+    assert np.array_equal(a, embedder.embed(['falafel wrap', 'baklava']))
+
+
+def test_menu_search_returns_relevant_item(tmp_path):
+    index = VectorIndex(str(tmp_path))
+    index.build([MenuSource()])
+    results = index.search(['how much is the falafel wrap', 'honey pastry dessert'], k=2)
+    assert any('Falafel Wrap' in chunk.text for chunk, _ in results[0])
+    assert results[1][0][0].metadata['item'] == 'Baklava'
+    assert results[0][0][1] >= results[0][1][1]
+    assert isinstance(index.vectors, np.memmap)
+
+
+def test_incremental_rebuild_and_shared_readers(tmp_path):
+    faq = tmp_path / 'faq.txt'
+    faq.write_text('We offer delivery within five miles.\n\nParking is free behind the building.')
+    index_dir = tmp_path / 'index'
+    writer = VectorIndex(str(index_dir))
+    first = writer.build([MenuSource(), TextFileSource(str(faq), 'faq', max_chars=40)])
+    assert first['embedded'] == first['chunks']
+
+    reader = VectorIndex(str(index_dir))
+    assert len(reader) == first['chunks']
+
+    faq.write_text('We offer delivery within five miles.\n\nWe accept all major credit cards.')
+    second = writer.build([MenuSource(), TextFileSource(str(faq), 'faq', max_chars=40)])
+    assert second['embedded'] == 1
+    assert reader.refresh()
+    top = reader.search(['do you take credit cards'], k=1)[0][0][0]
+    assert 'credit cards' in top.text
+    # The previous generation is kept for readers still opening it.
+    assert sorted(p.name for p in index_dir.glob('vectors-*.npy')) == ['vectors-0.npy', 'vectors-1.npy']
+
+
+def test_concurrent_cold_builds_do_not_clobber(tmp_path):
+    index_dir = tmp_path / 'index'
+
+    def build(_):
+        return VectorIndex(str(index_dir)).build([MenuSource()])
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        stats = list(pool.map(build, range(4)))
+    assert sum(s['embedded'] > 0 for s in stats) == 1
+    reader = VectorIndex(str(index_dir))
+    assert reader.generation == 0
+    assert len(reader.search(['baklava'])[0]) == 3
+    assert not list(index_dir.glob('.*.tmp'))
+
+
+
+def test_refresh_skips_unchanged_manifest(tmp_path, monkeypatch):
+    index = VectorIndex(str(tmp_path))
+    index.build([MenuSource()])
+    reader = VectorIndex(str(tmp_path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError('manifest re-read')
+
+    monkeypatch.setattr(retrieval.json, 'load', fail)
+    assert not reader.refresh()
@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+# Ensure the src package is on the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+
+from orchestra.knowledge.retrieval import TextFileSource, VectorIndex
+from orchestra.orchestration.chains.retrieval_chain import RetrievalChain
+
+
+def test_chain_rebuilds_when_source_changes(tmp_path):
+    faq = tmp_path / 'faq.txt'
+    faq.write_text('We offer delivery within five miles.')
+    source = TextFileSource(str(faq), 'faq')
+    chain = RetrievalChain(VectorIndex(str(tmp_path / 'index')), [source], k=1, check_interval=0)
+    assert 'delivery' in chain.run('do you deliver')
+
+    faq.write_text('We accept all major credit cards.')
+    assert 'credit cards' in chain.run('do you take credit cards')
+    assert chain.index.generation == 1
+
+
+def test_chain_checks_index_at_most_every_interval(tmp_path, monkeypatch):
+    faq = tmp_path / 'faq.txt'
+    faq.write_text('We offer delivery within five miles.')
+    index = VectorIndex(str(tmp_path / 'index'))
+    chain = RetrievalChain(index, [TextFileSource(str(faq), 'faq')], k=1, check_interval=60)
+    chain.run('do you deliver')
+    refreshes = []
+    monkeypatch.setattr(index, 'refresh', lambda: refreshes.append(1))
+    chain.run('do you deliver')
+    assert not refreshes
@@ -0,0 +1,76 @@
+import json
+import sys
+from pathlib import Path
+
+import msgpack
+import pytest
+
+# Ensure the src package is on the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+
+from orchestra.interfaces import ConversationState, Message, MessageType
+from orchestra.persistence.serialization import (
+    FLAG_COMPRESSED,
+    MAGIC,
+    SerializationError,
+    get_serializer,
+    loads_state,
+)
+
+
+def _state(num_messages=3):
+    messages = [
+        Message(
+            type=MessageType.USER_INPUT if i % 2 == 0 else MessageType.SYSTEM_RESPONSE,
+            content=f'message {i}',
+            metadata={'i': i},
+            timestamp=100.0 + i,
+            session_id='s1',
+        )
+        for i in range(num_messages)
+    ]
+    return ConversationState(session_id='s1', messages=messages, current_intent='general')
+
+
+@pytest.mark.parametrize('name', ['json', 'msgpack'])
+def test_round_trip(name):
+    state = _state()
+    data = get_serializer(name).dumps(state)
+    assert data.startswith(MAGIC)
+    assert loads_state(data).model_dump() == state.model_dump()
+
+
+def test_msgpack_is_smaller_than_json():
+    state = _state(20)
+    assert len(get_serializer('msgpack', None).dumps(state)) < len(
+        get_serializer('json', None).dumps(state)
+    )
+
+
+def test_compression_above_threshold():
+    state = _state(50)
+    data = get_serializer('msgpack', 64).dumps(state)
+    assert data[3] & FLAG_COMPRESSED
+    assert loads_state(data).model_dump() == state.model_dump()
+
+
+def test_legacy_json_payload():
+    state = _state()
+    legacy = json.dumps(state.model_dump(mode='json'))
+    assert loads_state(legacy).model_dump() == state.model_dump()
+
+
+def test_rejects_newer_format_version():
+    data = bytearray(get_serializer('msgpack').dumps(_state()))
+    data[2] = 99
+    with pytest.raises(SerializationError):
+        loads_state(bytes(data))
+
+
+def test_msgpack_short_message_lists():
+    header = MAGIC + bytes((1, 1))
+    body = msgpack.packb(['s1', [[0, 'hi', {}, 100.0]]])
+    message = loads_state(header + body).messages[0]
+    assert message.session_id == 's1' and message.content == 'hi'
+    with pytest.raises(SerializationError):
+        loads_state(header + msgpack.packb(['s1', [[0, 'hi']]]))
@@ -0,0 +1,150 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the src package is on the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+
+from orchestra.interfaces import ConversationState, Message, MessageType
+from orchestra.persistence.session_cache import LRUCache
+from orchestra.persistence.session_manager import SessionManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used_by_size():
+    cache = LRUCache(max_bytes=10)
+    cache.set('a', b'1234', 1)
+    cache.set('b', b'1234', 1)
+    cache.get('a')
+    cache.set('c', b'1234', 1)
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert cache.size_bytes == 8
+    assert cache.evictions == 1
+
+
+def test_lru_entries_expire():
+    clock = FakeClock()
+    cache = LRUCache(ttl=5, clock=clock)
+    cache.set('a', b'x', 1)
+    clock.now = 4
+    assert cache.get('a') is not None
+    clock.now = 5
+    assert cache.get('a') is None
+    assert cache.size_bytes == 0
+
+
+def test_degraded_mode_keeps_sessions_in_l1(monkeypatch):
+    monkeypatch.setenv('REDIS_URL', 'redis://127.0.0.1:1')
+    manager = SessionManager()
+    assert manager.degraded
+
+    async def scenario():
+        await manager.save_state(ConversationState(session_id='s1', current_intent='menu_query'))
+        return await manager.get_session('s1')
+
+    state = asyncio.run(scenario())
+    assert state.current_intent == 'menu_query'
+    stats = manager.stats()
+    assert stats['l1_hits'] == 1
+    assert stats['dirty_sessions'] == 1
+
+
+def test_pinned_entries_survive_eviction_and_expiry():
+    clock = FakeClock()
+    cache = LRUCache(max_bytes=8, ttl=5, clock=clock)
+    cache.pin('a')
+    cache.set('a', b'1234', 1)
+    cache.set('b', b'1234', 1)
+    cache.set('c', b'1234', 1)
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    clock.now = 10
+    assert cache.get('a') is not None
+    cache.unpin('a')
+    assert cache.get('a') is None
+
+
+def _shared_managers():
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.FakeServer()
+    managers = []
+    for _ in range(2):
+        manager = SessionManager()
+        manager.redis_client = fakeredis.FakeRedis(server=server)
+        manager.degraded = False
+        managers.append(manager)
+    return server, managers
+
+
+def test_stale_l1_entry_is_reread_from_redis():
+    _, (a, b) = _shared_managers()
+
+    async def scenario():
+        state = ConversationState(session_id='s1', current_intent='menu_query')
+        await a.save_state(state)
+        assert (await a.get_session('s1')).current_intent == 'menu_query'
+        state.current_intent = 'place_order'
+        await b.save_state(state)
+        return await a.get_session('s1')
+
+    state = asyncio.run(scenario())
+    assert state.current_intent == 'place_order'
+    assert a.stats()['l1_hits'] == 1
+    assert a.stats()['l1_stale'] == 1
+
+
+def test_degraded_writes_are_resynced_after_recovery():
+    server, (a, b) = _shared_managers()
+    a.cache = LRUCache(max_bytes=1, ttl=0)
+
+    async def scenario():
+        server.connected = False
+        await a.save_state(ConversationState(session_id='s1', current_intent='place_order'))
+        assert a.degraded
+        server.connected = True
+        a._next_retry = 0
+        await a.get_session('s1')
+        return await b.get_session('s1')
+
+    state = asyncio.run(scenario())
+    assert state.current_intent == 'place_order'
+    stats = a.stats()
+    assert not a.degraded
+    assert stats['resynced_sessions'] == 1
+    assert stats['resync_lost_sessions'] == 0
+    assert stats['dirty_sessions'] == 0
+
+
+def test_resync_merges_session_recreated_while_degraded():
+    server, (a, b) = _shared_managers()
+
+    def turn(session_id, content, ts):
+        return Message(type=MessageType.USER_INPUT, content=content, timestamp=ts, session_id=session_id)
+
+    async def scenario():
+        history = ConversationState(session_id='s1', messages=[turn('s1', f'turn {i}', i) for i in range(5)])
+        await a.save_state(history)
+        server.connected = False
+        await b.get_session('s1')
+        state = await b.get_or_create_session('s1')
+        assert not state.messages
+        state.messages.append(turn('s1', 'new', 10))
+        await b.save_state(state)
+        server.connected = True
+        b._next_retry = 0
+        await b.get_session('s1')
+        return await a.get_session('s1')
+
+    state = asyncio.run(scenario())
+    assert [m.content for m in state.messages] == [f'turn {i}' for i in range(5)] + ['new']
+    assert b.stats()['resync_conflicts'] == 1
@@ -0,0 +1,104 @@
+import asyncio
+import gzip
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure the src package is on the Python path
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+
+from orchestra.interfaces import ConversationState, Message, MessageType
+from orchestra.persistence.archive import ConversationArchive
+from orchestra.persistence.logging_service import LoggingService
+from orchestra.persistence.training_export import (
+    ExportFilters,
+    archive_tasks,
+    dedupe_turns,
+    export,
+    iter_log_records,
+    log_tasks,
+    redact_text,
+)
+
+
+def _read_shards(out_dir, manifest):
+    records = []
+    for shard in manifest['shards']:
+        with gzip.open(Path(out_dir) / shard['path'], 'rt') as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+def test_redacts_phone_numbers():
+    assert redact_text('call me at (555) 123-4567 or +1 555.987.6543') == (
+        'call me at [PHONE] or [PHONE]'
+    )
+    assert redact_text('two gyros') == 'two gyros'
+
+
+def test_dedupe_ignores_case_and_punctuation():
+    records = [
+        {'turns': [{'user': 'Hours?', 'assistant': 'We open at 9.'}]},
+        {'turns': [{'user': 'hours', 'assistant': 'we open at 9'}]},
+        {'turns': [{'user': 'menu', 'assistant': 'Here it is'}]},
+    ]
+    assert len(list(dedupe_turns(records))) == 2
+
+
+def test_logging_service_creates_log_directory(tmp_path):
+    path = tmp_path / 'logs' / 'interactions.jsonl'
+    service = LoggingService(str(path))
+    asyncio.run(service.log_interaction({'session_id': 's1', 'user_input': 'hi', 'ai_response': 'hello'}))
+    assert [r['session_id'] for r in iter_log_records(str(path))] == ['s1']
+
+
+def test_export_log_file(tmp_path):
+    log = tmp_path / 'interactions.jsonl'
+    entries = [
+        {'timestamp': '2024-01-01T10:00:00', 'session_id': 's1', 'tenant_id': 't1',
+         'user_input': 'my number is 555-123-4567', 'ai_response': 'thanks', 'intent': 'general'},
+        {'timestamp': '2024-01-01T11:00:00', 'session_id': 's2', 'tenant_id': 't2',
+         'user_input': 'menu?', 'ai_response': 'sure', 'intent': 'menu_query'},
+        {'timestamp': '2024-01-03T11:00:00', 'session_id': 's3', 'tenant_id': 't1',
+         'user_input': 'late', 'ai_response': 'ok', 'intent': 'general'},
+    ]
+    log.write_text('\n'.join(json.dumps(e) for e in entries) + '\nnot json\n')
+    out_dir = tmp_path / 'out'
+
+    filters = ExportFilters(end=datetime(2024, 1, 2), tenants={'t1'})
+    manifest = export(log_tasks([str(log)], filters), str(out_dir), shard_size=1)
+
+    records = _read_shards(out_dir, manifest)
+    assert manifest['records'] == 1
+    assert records[0]['turns'][0]['user'] == 'my number is [PHONE]'
+    assert json.loads((out_dir / 'manifest.json').read_text()) == manifest
+
+
+def test_export_archive_in_process_pool(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'archive.db'}"
+    archive = ConversationArchive(db_url)
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+
+    def state(session_id, ts, intent):
+        return ConversationState(session_id=session_id, messages=[
+            Message(type=MessageType.USER_INPUT, content=f'q {session_id}', timestamp=ts, session_id=session_id),
+            Message(type=MessageType.SYSTEM_RESPONSE, content='a', timestamp=ts + 1,
+                    session_id=session_id, metadata={'intent': intent}),
+        ])
+
+    async def fill():
+        await archive.start()
+        archive.archive(state('s1', day, 'menu_query'))
+        archive.archive(state('s2', day + 86400, 'general'))
+        archive.archive(state('s3', day + 86400, 'menu_query'))
+        await archive.stop()
+
+    asyncio.run(fill())
+    tasks = archive_tasks(
+        db_url, datetime(2024, 1, 1), datetime(2024, 1, 3), ExportFilters(intents={'menu_query'})
+    )
+    assert len(tasks) == 2
+    manifest = export(tasks, str(tmp_path / 'out'), processes=2)
+    records = _read_shards(tmp_path / 'out', manifest)
+    assert sorted(r['session_id'] for r in records) == ['s1', 's3']